@@ -1 +1 @@
-python3 -m pip install tkinter pandas matplotlib numpy fpdf openpyxl
\ No newline at end of file
+python3 -m pip install tkinter pandas matplotlib numpy fpdf openpyxl pypdf
\ No newline at end of file
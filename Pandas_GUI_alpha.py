@@ -1,144 +1,2589 @@
 import tkinter as tk
-from tkinter import filedialog, ttk, messagebox
+from tkinter import filedialog, ttk, messagebox, simpledialog
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 from fpdf import FPDF
 import os
+import io
+import ast
+import importlib.util
+import re
+import json
+import operator
+import itertools
+import time
+import shutil
+import sys
+import tempfile
+import sqlite3
+import pathlib
+from contextlib import closing
+import multiprocessing
+from collections import deque
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait
+
+# Кількість рядків для швидкого попереднього перегляду великих файлів
+PREVIEW_ROWS = 10000
+# Розмір блоку при потоковому читанні CSV
+CHUNK_ROWS = 200000
+# Інтервал опитування файлу в режимі стеження (мс)
+FOLLOW_INTERVAL_MS = 1000
+# Максимальна кількість байтів, що читаються за один крок стеження
+FOLLOW_MAX_BYTES = 16 * 1024 * 1024
+# Інтервал перевірки результатів фонових завдань (мс)
+TASK_POLL_MS = 50
+# Фонові завдання, результат яких залежить від поточних даних
+DATA_TASKS = ("filter", "clean", "suggest", "index", "page", "plot", "report", "charts")
+# Ширина стовпця таблиці (пікселі)
+COLUMN_WIDTH = 100
+# Кількість рядків таблиці, що оновлюються за один крок фонового перемальовування
+REFRESH_BATCH_ROWS = 2000
+# Шрифт DejaVuSans для підтримки Unicode у PDF
+FONT_PATH = "fonts/DejaVuSans-Bold.ttf"
+# Кількість рядків додатка звіту в одному PDF-файлі частини (FPDF збирає
+# вихідний файл конкатенацією, тож час запису великого документа квадратичний)
+APPENDIX_PART_ROWS = 10000
+# Кількість рядків однієї сторінки при читанні з SQLite
+SQL_PAGE_ROWS = 5000
+# Бюджет пам'яті для даних, кешів і графіків (МБ)
+MEMORY_BUDGET_MB = 1024
+# Інтервал обліку пам'яті (мс)
+MEMORY_POLL_MS = 2000
+# Таблиця вважається холодною, якщо до неї не зверталися стільки секунд
+MEMORY_COLD_SECONDS = 10
+# Порядок рядків статистики (як у describe(include="all"))
+STATISTICS_ROWS = ["count", "unique", "top", "freq", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
+
+def read_table_file(file_path, nrows=None, usecols=None):
+    """
+    Читання CSV або Excel файлу у DataFrame.
+    :param file_path: Шлях до файлу
+    :param nrows: Кількість рядків для читання (за замовчуванням - всі)
+    :param usecols: Стовпці для читання (за замовчуванням - всі)
+    :return: DataFrame з даними
+    """
+    if file_path.endswith(".csv"):
+        return pd.read_csv(file_path, nrows=nrows, usecols=usecols)
+    elif file_path.endswith(".xlsx"):
+        return pd.read_excel(file_path, nrows=nrows, usecols=usecols)
+    raise ValueError("Непідтримуваний формат файлу!")
+
+
+class FilePrefix:
+    """
+    Файл, обмежений першими size байтами (для читання pd.read_csv).
+    """
+
+    def __init__(self, file, size):
+        self.file = file
+        self.left = size
+
+    def read(self, size=-1):
+        if size < 0 or size > self.left:
+            size = self.left
+        data = self.file.read(size)
+        self.left -= len(data)
+        return data
+
+
+def read_table_snapshot(file_path):
+    """
+    Читання файлу в межах розміру, який він мав на початку читання.
+    Рядки, дописані під час читання, залишаються для режиму стеження.
+    :param file_path: Шлях до файлу
+    :return: (DataFrame з даними, позиція у файлі, з якої продовжується стеження)
+    """
+    size = os.path.getsize(file_path)
+    if not file_path.endswith(".csv"):
+        return read_table_file(file_path), size
+
+    with open(file_path, "rb") as file:
+        # Кінець останнього повного рядка в межах знімка
+        file.seek(max(size - FOLLOW_MAX_BYTES, 0))
+        tail = file.read(size - file.tell())
+        end = size - len(tail) + tail.rfind(b"\n") + 1
+        # Незавершений останній рядок, якщо файл не змінився, - просто рядок без переносу,
+        # інакше його дописують, і він буде прочитаний при стеженні
+        if end < size and os.path.getsize(file_path) == size:
+            end = size
+        file.seek(0)
+        return pd.read_csv(FilePrefix(file, end)), end
+
+
+def read_sample(file_path, n_rows=PREVIEW_ROWS, mode="head"):
+    """
+    Читання вибірки з файлу для попереднього перегляду.
+    :param file_path: Шлях до файлу
+    :param n_rows: Розмір вибірки
+    :param mode: "head" - перші n_rows рядків, "reservoir" - рівномірна
+                 резервуарна вибірка (лише для CSV, файл читається блоками)
+    :return: DataFrame з вибіркою
+    """
+    if mode == "head" or not file_path.endswith(".csv"):
+        return read_table_file(file_path, nrows=n_rows)
+
+    # Алгоритм R, векторизований по блоках: рядок з глобальним номером i
+    # потрапляє у слот j = randint(0, i); пізніші рядки перезаписують слот.
+    rng = np.random.default_rng()
+    pieces = []
+    seen = 0
+    for chunk in pd.read_csv(file_path, chunksize=CHUNK_ROWS):
+        positions = np.arange(seen, seen + len(chunk))
+        slots = np.where(positions < n_rows, positions, rng.integers(0, positions + 1))
+        take = slots < n_rows
+        if take.any():
+            piece = chunk[take].copy()
+            piece["__slot"] = slots[take]
+            pieces.append(piece)
+        seen += len(chunk)
+
+    if not pieces:
+        return pd.read_csv(file_path, nrows=0)
+    sample = pd.concat(pieces).drop_duplicates("__slot", keep="last")
+    return sample.drop(columns="__slot").sort_index()
+
+
+class HyperLogLog:
+    """
+    Оцінка кількості унікальних значень (HyperLogLog) з фіксованою пам'яттю.
+    """
+
+    def __init__(self, precision=12):
+        """
+        :param precision: Кількість бітів хешу для вибору регістра (2**precision регістрів)
+        """
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values):
+        """
+        Додавання значень до оцінки.
+        :param values: Series без пропущених значень
+        """
+        if len(values) == 0:
+            return
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        # Ранг - позиція першої одиниці у наступних 32 бітах хешу
+        rest = ((hashes << np.uint64(self.precision)) >> np.uint64(32)).astype(np.float64)
+        _, bit_length = np.frexp(rest)
+        rank = (33 - bit_length).astype(np.uint8)
+        best = pd.Series(rank).groupby(index).max()
+        positions = best.index.to_numpy()
+        self.registers[positions] = np.maximum(self.registers[positions], best.to_numpy())
+
+    def merge(self, other):
+        self.registers = np.maximum(self.registers, other.registers)
+
+    def estimate(self):
+        """
+        :return: Оцінка кількості унікальних значень
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # Лінійний підрахунок для малої кількості значень
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class TDigest:
+    """
+    Наближені квантилі (t-digest): значення групуються у центроїди,
+    дрібніші на краях розподілу, тому хвости оцінюються точніше.
+    """
+
+    def __init__(self, compression=100):
+        """
+        :param compression: Параметр стиснення (приблизна кількість центроїдів)
+        """
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.nan
+        self.max = np.nan
+
+    def update(self, values):
+        """
+        Додавання числових значень.
+        :param values: Масив значень без пропусків
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        self.min = np.nanmin([self.min, values.min()])
+        self.max = np.nanmax([self.max, values.max()])
+        if len(self.weights) == 0:
+            # Перший блок: достатньо відсортувати значення
+            self._compress(np.sort(values), np.ones(len(values)), is_sorted=True)
+            return
+        self._compress(
+            np.concatenate([self.means, values]),
+            np.concatenate([self.weights, np.ones(len(values))]),
+        )
+
+    def merge(self, other):
+        if len(other.weights) == 0:
+            return
+        self.min = np.nanmin([self.min, other.min])
+        self.max = np.nanmax([self.max, other.max])
+        self._compress(
+            np.concatenate([self.means, other.means]),
+            np.concatenate([self.weights, other.weights]),
+        )
+
+    def _compress(self, means, weights, is_sorted=False):
+        if not is_sorted:
+            order = np.argsort(means, kind="mergesort")
+            means, weights = means[order], weights[order]
+        total = weights.sum()
+        q = (np.cumsum(weights) - weights / 2) / total
+        # Масштабна функція k1: центроїд охоплює одиницю шкали k
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        groups = np.floor(k)
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q):
+        """
+        :param q: Рівень квантиля (0..1)
+        :return: Наближене значення квантиля
+        """
+        if len(self.weights) == 0:
+            return np.nan
+        total = self.weights.sum()
+        mids = np.concatenate([[0.0], np.cumsum(self.weights) - self.weights / 2, [total]])
+        means = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q * total, mids, means))
+
+
+class TopK:
+    """
+    Найчастіші значення стовпця. Зберігається обмежена кількість
+    лічильників, тож при доповненні даних результат наближений.
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+
+    def update(self, values):
+        counts = values.value_counts()
+        if len(self.counts):
+            counts = self.counts.add(counts, fill_value=0).astype(np.int64)
+        self.counts = counts.nlargest(self.capacity)
+
+    def top(self, n=10):
+        return self.counts.nlargest(n)
+
+
+class ColumnProfile:
+    """
+    Профіль стовпця: тип, пропуски, оцінка унікальних значень, мінімум/максимум,
+    квантилі та найчастіші значення. Обчислюється за один прохід і
+    доповнюється при додаванні рядків.
+    """
+
+    def __init__(self, dtype):
+        self.dtype = dtype
+        self.is_numeric = pd.api.types.is_numeric_dtype(dtype)
+        self.count = 0
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.mean = np.nan
+        self.m2 = 0.0
+        self.hll = HyperLogLog()
+        self.digest = TDigest() if self.is_numeric else None
+        # Для неперервних значень найчастіші значення не мають сенсу
+        self.topk = None if pd.api.types.is_float_dtype(dtype) else TopK()
+
+    @classmethod
+    def from_series(cls, series):
+        profile = cls(series.dtype)
+        profile.update(series)
+        return profile
+
+    def update(self, series):
+        """
+        Додавання значень до профілю.
+        :param series: Series з новими значеннями стовпця
+        """
+        values = series.dropna()
+        self.nulls += len(series) - len(values)
+        self.hll.update(values)
+        if self.topk is not None:
+            self.topk.update(values)
+        if len(values) == 0:
+            return
+
+        if self.is_numeric:
+            array = values.to_numpy(dtype=np.float64)
+            self.digest.update(array)
+            # Об'єднання середнього та дисперсії за формулою Чана
+            count, mean = len(array), array.mean()
+            m2 = ((array - mean) ** 2).sum()
+            if self.count == 0:
+                self.mean, self.m2 = mean, m2
+            else:
+                total = self.count + count
+                delta = mean - self.mean
+                self.mean += delta * count / total
+                self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count += len(values)
+
+        try:
+            low, high = values.min(), values.max()
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+        except TypeError:
+            pass
+
+    @property
+    def distinct(self):
+        return self.hll.estimate()
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan
+
+    def quantile(self, q):
+        return self.digest.quantile(q) if self.is_numeric else np.nan
+
+    def top(self, n=10):
+        if self.topk is None:
+            return pd.Series(dtype=np.int64)
+        return self.topk.top(n)
+
+    def describe(self):
+        """
+        :return: Series у форматі describe(include="all")
+        """
+        top = self.top(1)
+        result = {
+            "count": self.count,
+            "unique": np.nan if self.is_numeric else self.distinct,
+            "top": np.nan if self.is_numeric or top.empty else top.index[0],
+            "freq": np.nan if self.is_numeric or top.empty else top.iloc[0],
+        }
+        if self.is_numeric:
+            result.update({
+                "mean": self.mean,
+                "std": self.std,
+                "min": self.min,
+                "25%": self.quantile(0.25),
+                "50%": self.quantile(0.5),
+                "75%": self.quantile(0.75),
+                "max": self.max,
+            })
+        return pd.Series(result, dtype=object)
+
+
+class CsvFollower:
+    """
+    Стеження за CSV файлом, до якого дописуються рядки.
+    Читаються лише нові байти після останньої позиції; неповний
+    останній рядок зберігається до наступного читання.
+    """
+
+    def __init__(self, file_path, columns, dtypes, offset):
+        """
+        :param file_path: Шлях до CSV файлу
+        :param columns: Назви стовпців (заголовок файлу)
+        :param dtypes: Типи стовпців вже завантажених даних
+        :param offset: Позиція у файлі, з якої починається стеження
+        """
+        self.file_path = file_path
+        self.columns = list(columns)
+        self.dtypes = dtypes
+        self.offset = offset
+        self.remainder = b""
+
+    def read_new_rows(self, max_bytes=FOLLOW_MAX_BYTES):
+        """
+        Читання дописаних рядків.
+        :param max_bytes: Максимальна кількість байтів за один виклик
+        :return: (DataFrame з новими рядками або None, чи залишились непрочитані байти)
+        """
+        size = os.path.getsize(self.file_path)
+        if size < self.offset:
+            raise ValueError("Файл було скорочено або перезаписано.")
+        if size == self.offset:
+            return None, False
+
+        read_size = min(size - self.offset, max_bytes)
+        with open(self.file_path, "rb") as file:
+            file.seek(self.offset)
+            chunk = self.remainder + file.read(read_size)
+        self.offset += read_size
+
+        last_newline = chunk.rfind(b"\n")
+        if last_newline < 0:
+            self.remainder = chunk
+            return None, self.offset < size
+        complete, self.remainder = chunk[:last_newline + 1], chunk[last_newline + 1:]
+
+        rows = pd.read_csv(io.BytesIO(complete), header=None, names=self.columns)
+        for col, dtype in self.dtypes.items():
+            if rows[col].dtype != dtype:
+                try:
+                    rows[col] = rows[col].astype(dtype)
+                except (ValueError, TypeError):
+                    pass
+        return rows, self.offset < size
+
+
+class FilterCondition:
+    """
+    Умова фільтрації у вигляді виразу від x ("x<=100", "x>5 and x<50",
+    x!="Name1"). Прості порівняння з константами обчислюються векторно
+    для всього стовпця, інші вирази - построково, як lambda x: умова.
+    """
+
+    _OPERATORS = {
+        ast.Lt: operator.lt,
+        ast.LtE: operator.le,
+        ast.Gt: operator.gt,
+        ast.GtE: operator.ge,
+        ast.Eq: operator.eq,
+        ast.NotEq: operator.ne,
+    }
+    _SQL_OPERATORS = {
+        ast.Lt: "<",
+        ast.LtE: "<=",
+        ast.Gt: ">",
+        ast.GtE: ">=",
+        ast.Eq: "=",
+        ast.NotEq: "!=",
+    }
+    # Дзеркальні оператори для порівнянь виду "5 < x"
+    _FLIPPED = {
+        ast.Lt: ast.Gt,
+        ast.LtE: ast.GtE,
+        ast.Gt: ast.Lt,
+        ast.GtE: ast.LtE,
+        ast.Eq: ast.Eq,
+    }
+    # Вузли виразів, що не можуть викликати код: x, константи, порівняння,
+    # логічні та арифметичні операції
+    _SAFE_NODES = (
+        ast.Expression, ast.Name, ast.Load, ast.Constant, ast.List, ast.Tuple, ast.Set,
+        ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+        ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
+        ast.Compare, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq, ast.In, ast.NotIn,
+    )
+
+    def __init__(self, text):
+        """
+        :param text: Текст умови
+        """
+        self.text = text.strip()
+        # Спочатку перевіряється, що текст - один вираз, тож при створенні
+        # lambda нічого не виконується (лише при перевірці рядків)
+        self.tree = ast.parse(self.text, mode="eval").body
+        self.function = eval(f"lambda x: (\n{self.text}\n)")
+        self.vectorized = self._is_vectorizable(self.tree)
+        self.bounds = self._range_bounds(self.tree)
+
+    @classmethod
+    def is_safe(cls, text):
+        """
+        Чи є умова простим виразом від x без викликів функцій і звертань до
+        атрибутів. Інші умови виконуються як код Python.
+        :param text: Текст умови
+        """
+        try:
+            tree = ast.parse(text.strip(), mode="eval")
+        except SyntaxError:
+            return False
+        return all(
+            isinstance(node, cls._SAFE_NODES) and (not isinstance(node, ast.Name) or node.id == "x")
+            for node in ast.walk(tree)
+        )
+
+    def _range_bounds(self, node):
+        """
+        Межі діапазону, якщо умова є кон'юнкцією порівнянь x з константами
+        ("x<=100", "x>5 and x<50", "5<x<50", "x==7").
+        :return: Список пар (оператор, константа) у формі x <оператор> константа або None
+        """
+        if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+            bounds = []
+            for value in node.values:
+                part = self._range_bounds(value)
+                if part is None:
+                    return None
+                bounds.extend(part)
+            return bounds
+        if not isinstance(node, ast.Compare):
+            return None
+        operands = [node.left] + node.comparators
+        bounds = []
+        for op, left, right in zip(node.ops, operands, operands[1:]):
+            if type(op) not in self._FLIPPED:
+                return None
+            if self._is_variable(left) and self._is_constant(right):
+                bounds.append((type(op), ast.literal_eval(right)))
+            elif self._is_constant(left) and self._is_variable(right):
+                bounds.append((self._FLIPPED[type(op)], ast.literal_eval(left)))
+            else:
+                return None
+        return bounds
+
+    def _is_vectorizable(self, node):
+        if isinstance(node, ast.BoolOp):
+            return all(self._is_vectorizable(value) for value in node.values)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return self._is_vectorizable(node.operand)
+        if isinstance(node, ast.Compare):
+            operands = [node.left] + node.comparators
+            if not any(self._is_variable(operand) for operand in operands):
+                return False
+            for op, left, right in zip(node.ops, operands, operands[1:]):
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    # "x in 'abc'" - перевірка підрядка, векторно лише належність до набору
+                    if not (self._is_variable(left) and self._is_collection(right)):
+                        return False
+                elif type(op) not in self._OPERATORS:
+                    return False
+                elif not all(self._is_variable(o) or self._is_constant(o) for o in (left, right)):
+                    return False
+            return True
+        return False
+
+    @staticmethod
+    def _is_variable(node):
+        return isinstance(node, ast.Name) and node.id == "x"
+
+    @staticmethod
+    def _is_constant(node):
+        try:
+            ast.literal_eval(node)
+            return True
+        except ValueError:
+            return False
+
+    @classmethod
+    def _is_collection(cls, node):
+        return cls._is_constant(node) and isinstance(ast.literal_eval(node), (list, tuple, set))
+
+    def _evaluate(self, node, series):
+        if isinstance(node, ast.BoolOp):
+            combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+            result = self._evaluate(node.values[0], series)
+            for value in node.values[1:]:
+                result = combine(result, self._evaluate(value, series))
+            return result
+        if isinstance(node, ast.UnaryOp):
+            return ~self._evaluate(node.operand, series)
+
+        # Ланцюжок порівнянь (5 < x < 50) - кон'юнкція попарних порівнянь
+        operands = [series if self._is_variable(o) else ast.literal_eval(o) for o in [node.left] + node.comparators]
+        result = None
+        for op, left, right in zip(node.ops, operands, operands[1:]):
+            if isinstance(op, ast.In):
+                part = left.isin(list(right))
+            elif isinstance(op, ast.NotIn):
+                part = ~left.isin(list(right))
+            else:
+                part = self._OPERATORS[type(op)](left, right)
+            result = part if result is None else result & part
+        return result
+
+    def to_sql(self, column):
+        """
+        Переклад умови у вираз SQL WHERE. Порівняння з NULL дають 0 (для "!=" - 1),
+        як порівняння з NaN у pandas, тож "not" теж працює однаково.
+        :param column: Назва стовпця у лапках SQL
+        :return: (вираз, параметри) або None, якщо умову не можна перекласти
+        """
+        if not self.vectorized:
+            return None
+        params = []
+        try:
+            return self._sql(self.tree, column, params), params
+        except (TypeError, ValueError):
+            return None
+
+    def _sql(self, node, column, params):
+        if isinstance(node, ast.BoolOp):
+            joiner = " AND " if isinstance(node.op, ast.And) else " OR "
+            return "(" + joiner.join(self._sql(value, column, params) for value in node.values) + ")"
+        if isinstance(node, ast.UnaryOp):
+            return f"(NOT {self._sql(node.operand, column, params)})"
+
+        operands = [node.left] + node.comparators
+        parts = []
+        for op, left, right in zip(node.ops, operands, operands[1:]):
+            if isinstance(op, (ast.In, ast.NotIn)):
+                values = [self._sql_value(value) for value in ast.literal_eval(right)]
+                negate = isinstance(op, ast.NotIn)
+                if not values:
+                    parts.append("1" if negate else "0")
+                    continue
+                params.extend(values)
+                placeholders = ", ".join("?" * len(values))
+                parts.append(f"COALESCE({column} {'NOT IN' if negate else 'IN'} ({placeholders}), {int(negate)})")
+                continue
+            sides = []
+            for operand in (left, right):
+                if self._is_variable(operand):
+                    sides.append(column)
+                else:
+                    params.append(self._sql_value(ast.literal_eval(operand)))
+                    sides.append("?")
+            default = 1 if isinstance(op, ast.NotEq) else 0
+            parts.append(f"COALESCE({sides[0]} {self._SQL_OPERATORS[type(op)]} {sides[1]}, {default})")
+        return "(" + " AND ".join(parts) + ")"
+
+    @staticmethod
+    def _sql_value(value):
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, int) and abs(value) >= 2 ** 63:
+            raise TypeError(f"Число {value} завелике для SQLite.")
+        if isinstance(value, (int, float, str)):
+            return value
+        raise TypeError(f"Значення {value!r} не підтримується у SQL.")
+
+    def mask(self, series, cancel_token=None):
+        """
+        Обчислення маски умови для стовпця.
+        :param series: Series зі значеннями стовпця
+        :param cancel_token: CancelToken для переривання построкової перевірки
+        :return: Булевий масив numpy
+        """
+        if self.vectorized:
+            try:
+                result = self._evaluate(self.tree, series)
+                return pd.Series(result).fillna(False).to_numpy(dtype=bool)
+            except (TypeError, ValueError):
+                pass
+        return apply_condition(series, self.function, cancel_token)
+
+
+def apply_condition(series, condition, cancel_token=None):
+    """
+    Построкова перевірка умови блоками з перевіркою скасування між блоками.
+    :param series: Series зі значеннями стовпця
+    :param condition: Функція умови
+    :param cancel_token: CancelToken (необов'язковий)
+    :return: Булевий масив numpy
+    """
+    masks = []
+    for start in range(0, len(series), CHUNK_ROWS):
+        if cancel_token is not None:
+            cancel_token.check()
+        masks.append(series.iloc[start:start + CHUNK_ROWS].apply(condition).to_numpy(dtype=bool))
+    return np.concatenate(masks) if masks else np.zeros(0, dtype=bool)
+
+
+class SortedIndex:
+    """
+    Сортований вторинний індекс числового стовпця або стовпця дат: позиції
+    рядків, впорядковані за значенням (argsort), та відсортовані значення.
+    Діапазонні умови обчислюються двійковим пошуком за O(log n + k) замість
+    перегляду всього стовпця. Пропуски до індексу не потрапляють, бо жодне
+    порівняння для них не виконується. Після створення індекс не змінюється:
+    оновлення повертають новий індекс, тож його можна спільно використовувати
+    для кількох копій даних.
+    """
+
+    def __init__(self, order, values, is_datetime=False):
+        """
+        :param order: Позиції рядків у порядку зростання значень
+        :param values: Відсортовані значення (int64 або float64, дати - у наносекундах)
+        :param is_datetime: Індекс побудовано для стовпця дат
+        """
+        self.order = order
+        self.values = values
+        self.is_datetime = is_datetime
+
+    @staticmethod
+    def supports(series):
+        """
+        Чи можна індексувати стовпець (числа без bool та комплексних, дати без часового поясу).
+        """
+        dtype = series.dtype
+        if pd.api.types.is_datetime64_dtype(dtype):
+            return True
+        return (
+            pd.api.types.is_numeric_dtype(dtype)
+            and not pd.api.types.is_bool_dtype(dtype)
+            and not pd.api.types.is_complex_dtype(dtype)
+        )
+
+    @classmethod
+    def _values(cls, series):
+        """
+        Значення стовпця у вигляді ключів індексу.
+        :return: (ключі без пропусків, їх позиції у series, ознака стовпця дат)
+        """
+        if not cls.supports(series):
+            raise ValueError(f"Індекс можна побудувати лише для числового стовпця або стовпця дат ({series.dtype}).")
+        dtype = series.dtype
+        if pd.api.types.is_datetime64_dtype(dtype):
+            values = series.to_numpy(dtype="datetime64[ns]")
+            valid = ~np.isnat(values)
+            values = values.view(np.int64)
+        elif pd.api.types.is_integer_dtype(dtype) and isinstance(dtype, np.dtype) and dtype != np.uint64:
+            values = series.to_numpy(dtype=np.int64)
+            valid = None
+        else:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = ~np.isnan(values)
+        positions = np.arange(len(values), dtype=np.int64)
+        if valid is not None and not valid.all():
+            values, positions = values[valid], positions[valid]
+        return values, positions, pd.api.types.is_datetime64_dtype(dtype)
+
+    @classmethod
+    def from_series(cls, series):
+        """
+        Побудова індексу для стовпця.
+        :param series: Series зі значеннями стовпця
+        :return: SortedIndex
+        """
+        values, positions, is_datetime = cls._values(series)
+        order = np.argsort(values, kind="stable")
+        return cls(positions[order], values[order], is_datetime)
+
+    def insert(self, series, positions):
+        """
+        Додавання рядків до індексу (злиттям, без повного пересортування).
+        :param series: Стовпець після зміни
+        :param positions: Позиції нових рядків у стовпці
+        :return: Новий SortedIndex
+        """
+        return self._merge(self.order, self.values, series, np.asarray(positions, dtype=np.int64))
+
+    def replace(self, series, position):
+        """
+        Оновлення індексу після зміни значення одного рядка.
+        :param series: Стовпець після зміни
+        :param position: Позиція зміненого рядка
+        :return: Новий SortedIndex
+        """
+        keep = self.order != position
+        return self._merge(self.order[keep], self.values[keep], series, np.array([position], dtype=np.int64))
+
+    def _merge(self, order, values, series, positions):
+        added, found, is_datetime = self._values(series.take(positions))
+        if added.dtype != values.dtype or is_datetime != self.is_datetime:
+            # Змінився тип стовпця - індекс будується заново
+            return SortedIndex.from_series(series)
+        sort = np.argsort(added, kind="stable")
+        added = added[sort]
+        at = values.searchsorted(added, side="right")
+        return SortedIndex(
+            np.insert(order, at, positions[found[sort]]), np.insert(values, at, added), self.is_datetime
+        )
+
+    def take(self, positions, size):
+        """
+        Індекс для підмножини рядків (після фільтрації) без повторного сортування.
+        :param positions: Відсортовані позиції рядків, що залишились
+        :param size: Кількість рядків у вихідних даних
+        :return: SortedIndex з позиціями у підмножині
+        """
+        mask = np.zeros(size, dtype=bool)
+        mask[positions] = True
+        keep = mask[self.order]
+        remap = np.cumsum(mask) - 1
+        return SortedIndex(remap[self.order[keep]], self.values[keep], self.is_datetime)
+
+    def _key(self, op, constant):
+        """
+        Приведення межі умови до типу ключів індексу.
+        :return: (оператор, ключ), None - якщо межу не можна використати,
+                 (None, None) - якщо умові не відповідає жоден рядок
+        """
+        if self.is_datetime:
+            if not isinstance(constant, str):
+                return None
+            try:
+                timestamp = pd.Timestamp(constant)
+            except ValueError:
+                return None
+            if timestamp is pd.NaT or timestamp.tz is not None:
+                return None
+            return op, timestamp.value
+        if not isinstance(constant, (int, float)):
+            return None
+        try:
+            number = float(constant)
+        except OverflowError:
+            return None
+        if np.isnan(number):
+            return None
+        if self.values.dtype == np.float64:
+            return op, number
+        if not np.isfinite(number) or abs(number) >= 2 ** 62:
+            return None
+        if isinstance(constant, int) or number.is_integer():
+            return op, int(constant)
+        # Для цілих значень дробова межа замінюється найближчою цілою
+        if op is ast.Eq:
+            return None, None
+        if op in (ast.Gt, ast.GtE):
+            return ast.Gt, int(np.floor(constant))
+        return ast.Lt, int(np.ceil(constant))
+
+    def search(self, bounds):
+        """
+        Позиції рядків, що задовольняють усім межам.
+        :param bounds: Список пар (оператор, константа), див. FilterCondition.bounds
+        :return: Відсортований масив позицій або None, якщо межі не підходять до індексу
+        """
+        low, high = 0, len(self.values)
+        for op, constant in bounds:
+            key = self._key(op, constant)
+            if key is None:
+                return None
+            op, value = key
+            if op is None:
+                high = 0
+            elif op is ast.Eq:
+                low = max(low, self.values.searchsorted(value, side="left"))
+                high = min(high, self.values.searchsorted(value, side="right"))
+            elif op is ast.Gt:
+                low = max(low, self.values.searchsorted(value, side="right"))
+            elif op is ast.GtE:
+                low = max(low, self.values.searchsorted(value, side="left"))
+            elif op is ast.Lt:
+                high = min(high, self.values.searchsorted(value, side="left"))
+            else:
+                high = min(high, self.values.searchsorted(value, side="right"))
+        if low >= high:
+            return np.zeros(0, dtype=np.int64)
+        return np.sort(self.order[low:high])
+
+
+class TaskCancelled(Exception):
+    """
+    Завдання було скасоване або замінене новішим.
+    """
+
+
+class CancelToken:
+    """
+    Прапорець кооперативного скасування фонового завдання.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """
+        Перериває завдання, якщо його скасовано.
+        """
+        if self._event.is_set():
+            raise TaskCancelled()
+
+
+class Task:
+    def __init__(self, task_id, key, description, token, on_done, on_error, cancellable=True):
+        self.task_id = task_id
+        self.key = key
+        self.description = description
+        self.token = token
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancellable = cancellable
+        self.future = None
+
+
+class TaskScheduler:
+    """
+    Планувальник важких операцій. Завдання виконуються у пулі потоків,
+    результати повертаються у головний потік Tk через root.after.
+    Завдання з однаковим ключем замінюють одне одного: новий запит
+    скасовує попередній, а результат заміненого завдання відкидається.
+    """
+
+    def __init__(self, root, max_workers=4, on_status=None):
+        """
+        :param root: Головне вікно Tk
+        :param max_workers: Кількість робочих потоків
+        :param on_status: Функція, що отримує список описів активних завдань
+        """
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.results = queue.Queue()
+        self.tasks = {}
+        self.on_status = on_status
+        self.poll_job = None
+        self._ids = itertools.count()
+
+    def submit(self, key, func, *args, on_done=None, on_error=None, description="", cancellable=True):
+        """
+        Запуск завдання у фоні.
+        :param key: Ключ завдання (новий запит з тим самим ключем скасовує попередній)
+        :param func: Функція func(token, *args), що виконується у робочому потоці
+        :param on_done: Обробник результату (викликається у головному потоці)
+        :param on_error: Обробник помилки (викликається у головному потоці)
+        :param description: Опис для індикатора стану
+        :param cancellable: Чи скасовується завдання кнопкою "Скасувати" (службові
+                            завдання, як-от стеження за файлом, - ні)
+        """
+        self.cancel(key)
+        task = Task(next(self._ids), key, description, CancelToken(), on_done, on_error, cancellable)
+        task.future = self.executor.submit(self._run, task, func, args)
+        self.tasks[key] = task
+        self._schedule_poll()
+        self._notify()
+        return task
+
+    def _run(self, task, func, args):
+        try:
+            task.token.check()
+            self.results.put((task, func(task.token, *args), None))
+        except Exception as e:
+            self.results.put((task, None, e))
+
+    def cancel(self, key):
+        """
+        Скасування завдання за ключем.
+        """
+        task = self.tasks.pop(key, None)
+        if task is not None:
+            task.token.cancel()
+            task.future.cancel()
+            self._notify()
+
+    def cancel_all(self, force=False):
+        """
+        Скасування всіх завдань, які може скасувати користувач.
+        :param force: Скасувати також службові завдання
+        """
+        for key, task in list(self.tasks.items()):
+            if force or task.cancellable:
+                self.cancel(key)
+
+    def shutdown(self):
+        self.cancel_all(force=True)
+        if self.poll_job is not None:
+            self.root.after_cancel(self.poll_job)
+            self.poll_job = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule_poll(self):
+        if self.poll_job is None:
+            self.poll_job = self.root.after(TASK_POLL_MS, self._poll)
+
+    def _poll(self):
+        self.poll_job = None
+        try:
+            while True:
+                try:
+                    task, result, error = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                # Результати скасованих і замінених завдань відкидаються
+                if self.tasks.get(task.key) is not task:
+                    continue
+                del self.tasks[task.key]
+                self._notify()
+                if error is None:
+                    if task.on_done:
+                        task.on_done(result)
+                elif not isinstance(error, TaskCancelled) and task.on_error:
+                    task.on_error(error)
+        finally:
+            # Помилка в обробнику не повинна зупиняти опитування решти завдань
+            if self.tasks or not self.results.empty():
+                self._schedule_poll()
+
+    def _notify(self):
+        if self.on_status:
+            self.on_status([task.description for task in self.tasks.values()])
+
+
+def prepare_plot_data(token, data, x_column, y_column, plot_type, limit, processor=None):
+    """
+    Підготовка даних для графіка (виконується у фоновому потоці).
+    :param processor: DataProcessor з кешем профілів для автоматичного вибору типу
+    :return: (дані для побудови, стовпець X, стовпець Y, тип графіка)
+    """
+    x_original = x_column
+    # Вибір даних для побудови: лише потрібні стовпці, щоб не копіювати всю таблицю
+    data_limited = data.iloc[:limit][list(dict.fromkeys([x_column, y_column]))]
+
+    # Перевірка на числовий тип стовпців
+    x_is_numeric = pd.api.types.is_numeric_dtype(data_limited[x_column])
+    y_is_numeric = pd.api.types.is_numeric_dtype(data_limited[y_column])
+
+    # Якщо стовпець не числовий, рахуємо кількість повторень
+    if not x_is_numeric:
+        counts = data_limited[x_column].value_counts(sort=False)
+        data_limited = pd.DataFrame({x_column: counts.index, "Кількість": counts.values})
+        y_column = "Кількість"
+    token.check()
+
+    if not y_is_numeric:
+        counts = data_limited[y_column].value_counts(sort=False)
+        data_limited = pd.DataFrame({y_column: counts.index, "Кількість": counts.values})
+        x_column = y_column
+        y_column = "Кількість"
+    token.check()
+
+    if plot_type == "Автоматичний":
+        # Для повних даних кількість унікальних значень береться з профілю
+        if processor is not None and limit >= len(data) and x_column == x_original:
+            distinct = processor.profile(x_column).distinct
+        else:
+            distinct = data_limited[x_column].nunique()
+        plot_type = auto_plot_type(distinct, data_limited[y_column])
+    return data_limited, x_column, y_column, plot_type
+
+
+def auto_plot_type(distinct, y_values):
+    """
+    Автоматичний вибір типу графіка.
+    :param distinct: Кількість унікальних значень осі X
+    :param y_values: Значення осі Y
+    """
+    if distinct < 10:  # Кругова діаграма для категорій
+        return "Кругова діаграма"
+    if pd.api.types.is_numeric_dtype(y_values):
+        return "Лінійний"
+    return "Стовпчастий"
+
+
+def draw_plot_axes(ax, data_limited, x_column, y_column, plot_type):
+    """
+    Малювання підготовленого графіка на осях matplotlib.
+    """
+    if plot_type == "Лінійний":
+        ax.plot(data_limited[x_column], data_limited[y_column], marker="o")
+    elif plot_type == "Стовпчастий":
+        ax.bar(data_limited[x_column], data_limited[y_column])
+    elif plot_type == "Точковий":
+        ax.scatter(data_limited[x_column], data_limited[y_column])
+    elif plot_type == "Гістограма":
+        # Гістограма, обчислена базою даних, передає межі інтервалів і частоти в attrs
+        ax.hist(data_limited[y_column], bins=data_limited.attrs.get("bins", 10), weights=data_limited.attrs.get("weights"))
+    elif plot_type == "Кругова діаграма":
+        data_grouped = data_limited.groupby(x_column)[y_column].sum()
+        ax.pie(data_grouped, labels=data_grouped.index, autopct='%1.1f%%')
+
+    ax.set_title(f"{plot_type} графік: {y_column} vs {x_column}")
+    ax.set_xlabel(x_column)
+    ax.set_ylabel(y_column)
+
+
+def compact_font_subsets(pdf):
+    """
+    FPDF 1.7 додає до subset шрифту кожен символ кожної комірки, а при
+    збереженні перевіряє належність до цього списку для кожного символу
+    шрифту - на великих таблицях це квадратичний час. Дублікати
+    видаляються зі збереженням порядку (перший елемент важливий для FPDF).
+    """
+    for font in pdf.fonts.values():
+        if "subset" in font:
+            font["subset"][:] = dict.fromkeys(font["subset"])
+
+
+def write_appendix_pages(pdf, chunk, start_row):
+    """
+    Запис рядків даних у PDF як таблиць по сторінках. Стовпці, що не
+    вміщуються на сторінку, переносяться на наступні сторінки.
+    :param pdf: FPDF з підключеним шрифтом DejaVu
+    :param chunk: DataFrame з рядками для запису
+    :param start_row: Номер першого рядка блоку (для нумерації)
+    """
+    col_width = 30
+    number_width = 18
+    row_height = 6
+    max_chars = 18
+    max_cols_per_page = max(1, int((pdf.w - 20 - number_width) // col_width))
+    rows_per_page = int((pdf.h - 30) // row_height) - 1
+    columns = [str(col)[:max_chars] for col in chunk.columns]
+
+    pdf.set_font("DejaVu", size=7)
+    rows = list(chunk.itertuples(index=False, name=None))
+    for page_start in range(0, len(rows), rows_per_page):
+        page_rows = rows[page_start:page_start + rows_per_page]
+        for start_col in range(0, len(columns), max_cols_per_page):
+            end_col = start_col + max_cols_per_page
+            pdf.add_page()
+            pdf.cell(number_width, row_height, txt="№", border=1, align="C")
+            for col in columns[start_col:end_col]:
+                pdf.cell(col_width, row_height, txt=col, border=1, align="C")
+            pdf.ln(row_height)
+
+            for i, row in enumerate(page_rows, start_row + page_start + 1):
+                pdf.cell(number_width, row_height, txt=str(i), border=1)
+                for value in row[start_col:end_col]:
+                    pdf.cell(col_width, row_height, txt=str(value)[:max_chars], border=1)
+                pdf.ln(row_height)
+            compact_font_subsets(pdf)
+
+
+def render_appendix_part(chunk, start_row, output_path):
+    """
+    Рендеринг частини додатка в окремий PDF (виконується у робочому процесі).
+    """
+    pdf = FPDF()
+    pdf.add_font("DejaVu", "", FONT_PATH, uni=True)
+    write_appendix_pages(pdf, chunk, start_row)
+    pdf.output(output_path, "F")
+    return output_path
+
+
+def render_plot_file(output_path, data_limited, x_column, y_column, plot_type):
+    """
+    Збереження графіка у файл без вікна (backend Agg, безпечно поза головним потоком).
+    :param output_path: Шлях до файлу зображення (PNG/SVG)
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(6, 4))
+    FigureCanvasAgg(fig)
+    draw_plot_axes(fig.add_subplot(), data_limited, x_column, y_column, plot_type)
+    fig.savefig(output_path)
+    return output_path
+
+
+def unique_file_path(directory, name, extension, reserved=()):
+    """
+    Шлях до нового файлу в теці. Якщо файл з такою назвою вже існує,
+    до назви додається номер, тож попередні графіки і звіти не перезаписуються.
+    :param name: Бажана назва файлу без розширення
+    :param reserved: Шляхи, вже призначені іншим файлам поточного пакета
+    :return: Шлях до файлу
+    """
+    name = re.sub(r"[^\w.-]+", "_", name).strip("_.") or "file"
+    path = os.path.join(directory, f"{name}.{extension}")
+    number = 2
+    while os.path.exists(path) or path in reserved:
+        path = os.path.join(directory, f"{name}_{number}.{extension}")
+        number += 1
+    return path
+
+
+def render_chart_batch(prepared, charts):
+    """
+    Малювання групи графіків у робочому процесі. Графік, який не вдалося
+    побудувати (наприклад, кругова діаграма з від'ємними значеннями),
+    пропускається.
+    :param prepared: Словник {ключ: (дані, стовпець X, стовпець Y, тип графіка)}
+    :param charts: Список (шлях, ключ підготовлених даних)
+    :return: Шляхи до файлів (None для пропущених графіків)
+    """
+    paths = []
+    for path, key in charts:
+        try:
+            paths.append(render_plot_file(path, *prepared[key]))
+        except Exception as e:
+            print(f"Не вдалося побудувати графік {path}: {e}")
+            paths.append(None)
+    return paths
+
+
+def render_charts(token, processor, jobs, output_dir, file_format="png", limit=None):
+    """
+    Пакетна побудова графіків у файли. Дані готуються в основному процесі
+    один раз для кожного набору (кеш профілів процесора спільний для всіх
+    графіків, частоти нечислового стовпця не залежать від другого стовпця),
+    а малювання (backend Agg) розподіляється між робочими процесами.
+    Графіки з однаковими даними потрапляють в одну групу, тож кожен набір
+    даних пересилається робочим процесам приблизно один раз.
+    :param processor: DataProcessor (для SqlDataProcessor агрегати обчислює база)
+    :param jobs: Список (стовпець X, стовпець Y, тип графіка)
+    :param output_dir: Тека для файлів
+    :param file_format: "png" або "svg"
+    :param limit: Кількість рядків для графіків (за замовчуванням - всі)
+    :return: Шляхи до файлів у порядку jobs (без графіків, які не вдалося побудувати)
+    """
+    if limit is None:
+        limit = processor.count_rows()
+    prepared = {}
+    charts = []
+    paths = set()
+    for x_column, y_column, plot_type in jobs:
+        token.check()
+        if not pd.api.types.is_numeric_dtype(processor.data[x_column]):
+            key = (x_column, None, plot_type)
+        elif not pd.api.types.is_numeric_dtype(processor.data[y_column]):
+            key = (None, y_column, plot_type)
+        else:
+            key = (x_column, y_column, plot_type)
+        if key not in prepared:
+            prepared[key] = processor.plot_data(token, x_column, y_column, plot_type, limit)
+        path = unique_file_path(output_dir, f"{x_column}_{y_column}_{plot_type}", file_format, paths)
+        paths.add(path)
+        charts.append((path, key))
+
+    workers = max(1, min(os.cpu_count() or 1, 8, len(charts)))
+    if workers == 1:
+        rendered = []
+        for chart in charts:
+            token.check()
+            rendered.extend(render_chart_batch(prepared, [chart]))
+        return [path for path in rendered if path]
+
+    # Графіки передаються групами, щоб не платити за пересилання кожного окремо;
+    # кожна група отримує лише дані своїх графіків
+    order = {key: number for number, key in enumerate(prepared)}
+    grouped = sorted(charts, key=lambda chart: order[chart[1]])
+    size = -(-len(grouped) // (workers * 4))
+    batches = [grouped[i:i + size] for i in range(0, len(grouped), size)]
+    # spawn: робочі процеси не успадковують потоки Tk
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [
+            pool.submit(render_chart_batch, {key: prepared[key] for _, key in batch}, batch) for batch in batches
+        ]
+        try:
+            while wait(futures, timeout=0.2).not_done:
+                token.check()
+        except TaskCancelled:
+            for future in futures:
+                future.cancel()
+            raise
+        rendered = {path for future in futures for path in future.result() if path}
+    return [path for path, _ in charts if path in rendered]
+
 
 class DataProcessor:
-    def __init__(self, data):
+    def __init__(self, data, approximate=False, profiles=None, indexes=None):
+        """
+        :param data: DataFrame з даними
+        :param approximate: Дані є вибіркою, статистика наближена
+        :param profiles: Кеш профілів стовпців, обчислених для цих самих даних
+        :param indexes: Сортовані індекси стовпців (SortedIndex), побудовані для цих самих даних
+        """
         self.data = data
+        self.approximate = approximate
+        # Профілі стовпців обчислюються один раз для кожної версії даних
+        self.version = 0
+        self.profiles = profiles if profiles is not None else {}
+        self._profile_lock = threading.Lock()
+        self.indexes = indexes if indexes is not None else {}
+        # Точна статистика стовпців: {стовпець: (версія даних, Series)}
+        self.exact_statistics = {}
+
+    def profile(self, column):
+        """
+        Профіль стовпця (обчислюється при першому зверненні і кешується).
+        :param column: Назва стовпця
+        :return: ColumnProfile
+        """
+        with self._profile_lock:
+            if column not in self.profiles:
+                self.profiles[column] = ColumnProfile.from_series(self.data[column])
+            return self.profiles[column]
+
+    def create_index(self, column):
+        """
+        Побудова сортованого індексу стовпця. Діапазонні умови за цим
+        стовпцем далі обчислюються двійковим пошуком.
+        :param column: Назва стовпця
+        :return: SortedIndex
+        """
+        index = SortedIndex.from_series(self.data[column])
+        self.indexes[column] = index
+        return index
+
+    def profile_statistics(self, columns):
+        """
+        Статистика у форматі describe(include="all"). Для вибірки будується
+        з кешованих профілів (наближена), для повних даних - точна.
+        :param columns: Стовпці для статистики
+        :return: DataFrame зі статистикою
+        """
+        columns = list(columns)
+        if self.approximate:
+            stats = pd.DataFrame({col: self.profile(col).describe() for col in columns})
+            return stats.reindex(STATISTICS_ROWS).dropna(how="all")
+
+        # Дані повністю в пам'яті: квартилі, кількість унікальних і найчастіші
+        # значення обчислюються точно і кешуються до зміни даних
+        version = self.version
+        stale = [col for col in columns if self.exact_statistics.get(col, (None,))[0] != version]
+        if stale:
+            described = self.data[stale].describe(include="all")
+            for col in stale:
+                self.exact_statistics[col] = (version, described[col])
+        stats = pd.DataFrame({col: self.exact_statistics[col][1] for col in columns})
+        return stats.reindex(STATISTICS_ROWS).dropna(how="all")
+
+    def append(self, rows, combined=None):
+        """
+        Додавання нових рядків до даних з інкрементальним оновленням профілів.
+        :param rows: DataFrame з новими рядками
+        :param combined: Вже об'єднані дані (pd.concat, обчислений у фоновому потоці)
+        """
+        start = len(self.data)
+        self.data = pd.concat([self.data, rows]) if combined is None else combined
+        with self._profile_lock:
+            for column, profile in self.profiles.items():
+                profile.update(rows[column])
+        positions = np.arange(start, len(self.data))
+        for column, index in list(self.indexes.items()):
+            if SortedIndex.supports(self.data[column]):
+                self.indexes[column] = index.insert(self.data[column], positions)
+            else:
+                del self.indexes[column]
+        self.version += 1
+
+    def update_cell(self, position, column, value):
+        """
+        Зміна значення комірки з приведенням до типу стовпця.
+        :param position: Номер рядка (позиційний)
+        :param column: Назва стовпця
+        :param value: Нове значення (рядок з поля вводу)
+        :return: Значення, записане у дані
+        """
+        dtype = self.data[column].dtype
+        if value == "" or value == "nan":
+            converted = np.nan
+        elif pd.api.types.is_bool_dtype(dtype):
+            if value.strip().lower() not in ("true", "false", "1", "0"):
+                raise ValueError(f"Значення '{value}' не відповідає типу стовпця {column} ({dtype}).")
+            converted = value.strip().lower() in ("true", "1")
+        else:
+            try:
+                converted = pd.Series([value]).astype(dtype).iloc[0]
+            except (ValueError, TypeError):
+                raise ValueError(f"Значення '{value}' не відповідає типу стовпця {column} ({dtype}).")
+        self.data.iat[position, self.data.columns.get_loc(column)] = converted
+        # Кеш профілів може бути спільним з оригінальними даними, тому створюється новий
+        self.profiles = {key: profile for key, profile in self.profiles.items() if key != column}
+        # Індекси теж можуть бути спільними, тому змінений індекс записується у новий словник
+        index = self.indexes.get(column)
+        self.indexes = {key: value for key, value in self.indexes.items() if key != column}
+        if index is not None and SortedIndex.supports(self.data[column]):
+            self.indexes[column] = index.replace(self.data[column], position)
+        self.version += 1
+        return converted
+
+    def filter_data(self, column, condition, cancel_token=None):
+        """
+        Фільтрація даних за вказаним стовпцем і умовою.
+        :param column: Назва стовпця
+        :param condition: Функція умови або текст умови від x (FilterCondition)
+        :param cancel_token: CancelToken для переривання фільтрації великих даних
+        :return: Відфільтровані дані
+        """
+        return self.filter_many([(column, condition)], cancel_token)
+
+    def filter_many(self, conditions, cancel_token=None):
+        """
+        Злиття кількох послідовних фільтрів в одну маску: кожна наступна умова
+        перевіряється лише на рядках, що пройшли попередні, а рядки даних
+        копіюються один раз наприкінці.
+        :param conditions: Список пар (стовпець, умова)
+        :param cancel_token: CancelToken (необов'язковий)
+        :return: Відфільтровані дані
+        """
+        return self.data.take(self.filter_positions(conditions, cancel_token))
+
+    def filter_positions(self, conditions, cancel_token=None):
+        """
+        Позиції рядків, що задовольняють усім умовам. Діапазонні умови за
+        проіндексованими стовпцями обчислюються першими двійковим пошуком,
+        решта перевіряється лише на рядках, що залишились.
+        :param conditions: Список пар (стовпець, умова)
+        :param cancel_token: CancelToken (необов'язковий)
+        :return: Відсортований масив позицій рядків
+        """
+        positions = None
+        scans = []
+        for column, condition in conditions:
+            if column not in self.data.columns:
+                raise ValueError(f"Стовпець {column} відсутній у даних.")
+            if isinstance(condition, str):
+                condition = FilterCondition(condition)
+            found = None
+            index = self.indexes.get(column)
+            if index is not None and isinstance(condition, FilterCondition) and condition.bounds is not None:
+                found = index.search(condition.bounds)
+            if found is None:
+                scans.append((column, condition))
+            elif positions is None:
+                positions = found
+            else:
+                positions = np.intersect1d(positions, found, assume_unique=True)
+
+        if positions is None:
+            positions = np.arange(len(self.data))
+        for column, condition in scans:
+            if cancel_token is not None:
+                cancel_token.check()
+            series = self.data[column].take(positions)
+            if isinstance(condition, FilterCondition):
+                mask = condition.mask(series, cancel_token)
+            else:
+                mask = apply_condition(series, condition, cancel_token)
+            positions = positions[mask]
+        return positions
+
+    def filtered(self, conditions, cancel_token=None):
+        """
+        Обробник відфільтрованих даних.
+        :param conditions: Список пар (стовпець, умова)
+        :param cancel_token: CancelToken (необов'язковий)
+        :return: DataProcessor
+        """
+        return self.subset(self.filter_positions(conditions, cancel_token))
+
+    def subset(self, positions):
+        """
+        Обробник для підмножини рядків з перенесеними індексами.
+        :param positions: Відсортовані позиції рядків (результат filter_positions)
+        :return: DataProcessor
+        """
+        indexes = {column: index.take(positions, len(self.data)) for column, index in self.indexes.items()}
+        return DataProcessor(self.data.take(positions), approximate=self.approximate, indexes=indexes)
+
+    def clean_data(self):
+        """
+        Очищення даних:
+        - Заповнення відсутніх значень середнім.
+        - Видалення дублювань.
+        :return: Очищені дані
+        """
+        self.data.fillna(self.data.mean(numeric_only=True), inplace=True)
+        self.data.drop_duplicates(inplace=True)
+        self.profiles.clear()
+        # Позиції рядків змінились - індекси будуються заново
+        self.indexes = {
+            column: SortedIndex.from_series(self.data[column])
+            for column in self.indexes
+            if SortedIndex.supports(self.data[column])
+        }
+        self.version += 1
+
+    def count_rows(self):
+        """
+        Кількість рядків даних.
+        """
+        return len(self.data)
+
+    def select(self, columns):
+        """
+        Усі рядки вибраних стовпців.
+        :param columns: Список стовпців
+        :return: DataFrame
+        """
+        return self.data[list(columns)]
+
+    def iter_rows(self, columns, size=APPENDIX_PART_ROWS):
+        """
+        Рядки вибраних стовпців блоками (для додатка звіту).
+        :param columns: Список стовпців
+        :param size: Кількість рядків у блоці
+        :return: Генератор DataFrame
+        """
+        data = self.select(columns)
+        for start in range(0, len(data), size):
+            yield data.iloc[start:start + size]
+
+    def plot_data(self, token, x_column, y_column, plot_type, limit):
+        """
+        Підготовка даних для графіка (див. prepare_plot_data).
+        """
+        return prepare_plot_data(token, self.data, x_column, y_column, plot_type, limit, self)
+
+    def calculate_statistics(self):
+        """
+        Обчислення базової статистики для числових стовпців.
+        :return: DataFrame зі статистикою
+        """
+        numeric_columns = self.data.select_dtypes(include=[np.number]).columns
+        return self.profile_statistics(numeric_columns)
+
+    
+    def generate_report(self, output_path, selected_columns=None, include_graphics=True, image_files=None,
+                        include_appendix=False, cancel_token=None):
+        """
+        Генерація звіту у форматі PDF.
+        :param output_path: Шлях до файлу звіту.
+        :param selected_columns: Вибрані стовпці для звіту (за замовчуванням - всі).
+        :param include_graphics: Чи включати графіки у звіт.
+        :param image_files: Файли графіків (якщо не вказано - запитуються у користувача).
+        :param include_appendix: Чи додавати у звіт рядки вибраних стовпців.
+        :param cancel_token: CancelToken для переривання рендерингу додатка.
+        """
+        from tkinter import filedialog
+
+        pdf = FPDF()
+        pdf.add_page()
+
+        # Підключення шрифту DejaVuSans для підтримки Unicode
+        font_path = FONT_PATH
+        if not os.path.exists(font_path):
+            print("Шрифт не знайдений!")
+            return
+
+        pdf.add_font("DejaVu", "", font_path, uni=True)
+        pdf.set_font("DejaVu", size=12)
+
+        # Заголовок
+        pdf.set_font("DejaVu", size=16)
+        pdf.cell(200, 10, txt="Звіт про дані", ln=True, align="C")
+        pdf.ln(10)
+
+        # Вибір стовпців (якщо користувач нічого не вибрав, використовуються всі)
+        if selected_columns is None:
+            selected_columns = self.data.columns
+        selected_columns = list(selected_columns)
+
+        # Базова статистика
+        pdf.set_font("DejaVu", size=12)
+        if self.approximate:
+            pdf.cell(200, 10, txt="Базова статистика (наближена, за вибіркою):", ln=True)
+        else:
+            pdf.cell(200, 10, txt="Базова статистика:", ln=True)
+        pdf.ln(5)
+
+        stats = self.profile_statistics(selected_columns)
+        col_width = 45  # Ширина стовпців у таблиці
+        row_height = 8  # Висота рядків у таблиці
+        page_width = pdf.w - 35  # Ширина сторінки (з урахуванням відступів)
+        max_cols_per_page = int(page_width // col_width)  # Максимальна кількість стовпців на сторінці
+        max_rows_per_page = int((pdf.h - 40) // row_height)
+        # Розбиття таблиці на частини, якщо стовпці не вміщуються
+        pdf.set_font("DejaVu", size=10)
+        for start_col in range(0, len(stats.columns), max_cols_per_page):
+            end_col = start_col + max_cols_per_page
+            subset_columns = stats.columns[start_col:end_col]
+
+            # Заголовок таблиці
+            pdf.cell(col_width, row_height, txt="Параметр", border=1, align="C")
+            for col in subset_columns:
+                pdf.cell(col_width, row_height, txt=str(col), border=1, align="C")
+            pdf.ln(row_height)
+
+            # Дані таблиці
+            for index, row in stats.iterrows():
+                if pdf.get_y() + row_height > pdf.h - 20 :
+                    pdf.add_page()
+                    pdf.cell(col_width, row_height, txt="Параметр", border=1, align="C")
+                    for col in subset_columns:
+                        pdf.cell(col_width, row_height, txt=str(col), border=1, align="C")
+                    pdf.ln(row_height)
+
+                pdf.cell(col_width, row_height, txt=str(index), border=1)
+                for col in subset_columns:
+                    value = row[col]
+                    cell_value = f"{value:.2f}" if pd.api.types.is_numeric_dtype(value) else str(value)
+                    pdf.cell(col_width, row_height, txt=cell_value, border=1)
+                pdf.ln(row_height)
+
+            # Перехід на нову сторінку для наступної частини таблиці
+            pdf.ln(5)
+            #pdf.add_page()
+
+        # Додавання графіків
+        if include_graphics:
+            pdf.add_page()
+            pdf.set_font("DejaVu", size=14)
+            pdf.cell(200, 10, txt="Графіки:", ln=True)
+            pdf.ln(10)
+
+            # Запит у користувача на вибір файлів із графіками
+            if image_files is None:
+                image_files = filedialog.askopenfilenames(
+                    title="Оберіть файли графіків",
+                    filetypes=[("Зображення", "*.png;*.jpg;*.jpeg;*.bmp")],
+                )
+
+            for image_path in image_files:
+                try:
+                    pdf.image(image_path, x=10, y=pdf.get_y(), w=170)
+                    pdf.ln(130)
+                except Exception as e:
+                    print(f"Не вдалося додати графік {image_path}: {e}")
+
+        # Збереження звіту
+        if include_appendix:
+            self.write_appendix(pdf, output_path, self.iter_rows(selected_columns), cancel_token)
+        else:
+            pdf.output(output_path, "F")
+        print(f"Звіт збережено у файл: {output_path}")
+
+    def write_appendix(self, pdf, output_path, chunks, cancel_token=None):
+        """
+        Додаток з рядками даних. Великі додатки рендеряться окремими PDF-частинами
+        у робочих процесах (не більше двох частин на процес одночасно, тож
+        пам'ять обмежена) і об'єднуються з основним звітом через pypdf.
+        Без pypdf рядки записуються блоками в основний документ.
+        :param pdf: FPDF з основною частиною звіту
+        :param output_path: Шлях до файлу звіту
+        :param chunks: Блоки рядків вибраних стовпців (iter_rows); кожен блок - окрема частина
+        """
+        try:
+            from pypdf import PdfWriter
+        except ImportError:
+            PdfWriter = None
+
+        chunks = (chunk for chunk in chunks if not chunk.empty)
+        head = list(itertools.islice(chunks, 2))
+        chunks = itertools.chain(head, chunks)
+        if PdfWriter is None or len(head) < 2:
+            start = 0
+            for chunk in chunks:
+                if cancel_token is not None:
+                    cancel_token.check()
+                write_appendix_pages(pdf, chunk, start)
+                start += len(chunk)
+            pdf.output(output_path, "F")
+            return
+
+        # Окрема нова тека поруч зі звітом: існуючі файли користувача не зачіпаються
+        temp_dir = tempfile.mkdtemp(prefix=".parts-", dir=os.path.dirname(os.path.abspath(output_path)))
+        try:
+            main_path = os.path.join(temp_dir, "main.pdf")
+            pdf.output(main_path, "F")
+
+            part_paths = []
+            start = 0
+            workers = max(1, min(os.cpu_count() or 1, 8))
+            if workers == 1:
+                for chunk in chunks:
+                    if cancel_token is not None:
+                        cancel_token.check()
+                    part_paths.append(os.path.join(temp_dir, f"part_{len(part_paths)}.pdf"))
+                    render_appendix_part(chunk, start, part_paths[-1])
+                    start += len(chunk)
+            else:
+                pending = deque()
+                # spawn: робочі процеси не успадковують потоки Tk
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                    for chunk in chunks:
+                        if cancel_token is not None:
+                            cancel_token.check()
+                        if len(pending) >= 2 * workers:
+                            pending.popleft().result()
+                        part_paths.append(os.path.join(temp_dir, f"part_{len(part_paths)}.pdf"))
+                        pending.append(pool.submit(render_appendix_part, chunk, start, part_paths[-1]))
+                        start += len(chunk)
+                    for future in pending:
+                        future.result()
+
+            writer = PdfWriter()
+            for path in [main_path] + part_paths:
+                writer.append(path)
+            with open(output_path, "wb") as file:
+                writer.write(file)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+def quote_identifier(name):
+    """
+    Назва таблиці або стовпця у лапках SQL.
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class SqliteSource:
+    """
+    Таблиця або запит SQLite як джерело даних. Умови фільтрів і вибір
+    стовпців передаються у WHERE/SELECT, тож з бази читаються лише потрібні
+    рядки і стовпці. Умови, які не перекладаються у SQL, перевіряються
+    після читання.
+    """
+
+    def __init__(self, path, table=None, query=None, conditions=()):
+        """
+        :param path: Шлях до файлу бази
+        :param table: Назва таблиці або представлення
+        :param query: Запит SELECT (замість таблиці)
+        :param conditions: Список пар (стовпець, FilterCondition)
+        """
+        if not table and not query:
+            raise ValueError("Вкажіть таблицю або запит SQL.")
+        self.path = path
+        self.table = table
+        self.query = query.strip().rstrip(";") if query else None
+        self.conditions = list(conditions)
+        self.where, self.params, self.residual = self._translate(self.conditions)
+
+    @staticmethod
+    def connect(path):
+        """
+        З'єднання з базою лише для читання (файл не створюється, якщо його немає).
+        """
+        return sqlite3.connect(pathlib.Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+
+    @classmethod
+    def list_tables(cls, path):
+        """
+        Таблиці та представлення бази.
+        """
+        with closing(cls.connect(path)) as connection:
+            rows = connection.execute(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'view') "
+                "AND name NOT LIKE 'sqlite_%' ORDER BY name"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    @property
+    def relation(self):
+        return quote_identifier(self.table) if self.query is None else f"({self.query})"
+
+    @staticmethod
+    def _translate(conditions):
+        clauses, params, residual = [], [], []
+        for column, condition in conditions:
+            sql = condition.to_sql(quote_identifier(column)) if isinstance(condition, FilterCondition) else None
+            if sql is None:
+                residual.append((column, condition))
+            else:
+                clauses.append(sql[0])
+                params.extend(sql[1])
+        return " AND ".join(clauses), params, residual
+
+    def with_conditions(self, conditions):
+        """
+        Джерело з додатковими умовами фільтрації.
+        :param conditions: Список пар (стовпець, умова)
+        :return: SqliteSource
+        """
+        parsed = [
+            (column, FilterCondition(condition) if isinstance(condition, str) else condition)
+            for column, condition in conditions
+        ]
+        return SqliteSource(self.path, self.table, self.query, self.conditions + parsed)
+
+    def select_sql(self, columns=None):
+        """
+        Запит SELECT вибраних стовпців з умовами фільтрів.
+        :return: (текст запиту, параметри)
+        """
+        select = ", ".join(quote_identifier(column) for column in columns) if columns else "*"
+        sql = f"SELECT {select} FROM {self.relation}"
+        if self.where:
+            sql += f" WHERE {self.where}"
+        return sql, list(self.params)
+
+    def read(self, sql, params=()):
+        """
+        Виконання запиту у новому з'єднанні (з'єднання SQLite не можна ділити між потоками).
+        :return: DataFrame
+        """
+        with closing(self.connect(self.path)) as connection:
+            return pd.read_sql_query(sql, connection, params=list(params))
+
+    def fetch(self, columns=None, offset=0, limit=None):
+        """
+        Читання рядків (сторінки) з урахуванням умов фільтрів.
+        :param columns: Стовпці (за замовчуванням - всі)
+        :param offset: Номер першого рядка результату запиту
+        :param limit: Кількість рядків (за замовчуванням - до кінця)
+        :return: (DataFrame, кількість рядків, прочитаних з бази до перевірки решти умов)
+        """
+        needed = None
+        if columns:
+            needed = list(dict.fromkeys(list(columns) + [column for column, _ in self.residual]))
+        sql, params = self.select_sql(needed)
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params += [-1 if limit is None else limit, offset]
+        data = self.read(sql, params)
+        fetched = len(data)
+        data.index = pd.RangeIndex(offset, offset + fetched)
+        if self.residual:
+            data = DataProcessor(data).filter_many(self.residual)
+        if columns:
+            data = data[list(columns)]
+        return data, fetched
+
+    def pages(self, columns, size=SQL_PAGE_ROWS):
+        """
+        Читання всіх рядків результату сторінками через один курсор
+        (без OFFSET, тож кожен рядок читається з бази один раз).
+        :param columns: Стовпці
+        :param size: Кількість рядків, що читаються з бази за раз
+        :return: Генератор DataFrame (решта умов уже перевірена)
+        """
+        columns = list(columns)
+        needed = list(dict.fromkeys(columns + [column for column, _ in self.residual]))
+        sql, params = self.select_sql(needed)
+        offset = 0
+        with closing(self.connect(self.path)) as connection:
+            for data in pd.read_sql_query(sql, connection, params=params, chunksize=size):
+                data.index = pd.RangeIndex(offset, offset + len(data))
+                offset += len(data)
+                if self.residual:
+                    data = DataProcessor(data).filter_many(self.residual)
+                yield data[columns]
+
+    def count(self):
+        """
+        Кількість рядків, що задовольняють умовам.
+        """
+        if self.residual:
+            return len(self.fetch([self.residual[0][0]])[0])
+        sql, params = self.select_sql()
+        return int(self.read(f"SELECT COUNT(*) FROM ({sql})", params).iloc[0, 0])
+
+    def statistics(self, columns, numeric):
+        """
+        Статистика стовпців у форматі describe(include="all"), обчислена базою.
+        :param columns: Стовпці для статистики
+        :param numeric: Назви числових стовпців (решта - категоріальні)
+        :return: DataFrame зі статистикою
+        """
+        inner, params = self.select_sql(columns)
+        stats = {}
+        with closing(self.connect(self.path)) as connection:
+            # Кількість, середнє, мінімум і максимум усіх стовпців - за один прохід
+            parts = []
+            for column in columns:
+                name = quote_identifier(column)
+                if column in numeric:
+                    parts += [f"COUNT({name})", f"AVG({name})", f"MIN({name})", f"MAX({name})"]
+                else:
+                    parts += [f"COUNT({name})", f"COUNT(DISTINCT {name})"]
+            values = iter(connection.execute(f"SELECT {', '.join(parts)} FROM ({inner})", params).fetchone())
+            for column in columns:
+                if column in numeric:
+                    stats[column] = dict(zip(["count", "mean", "min", "max"], itertools.islice(values, 4)))
+                else:
+                    stats[column] = dict(zip(["count", "unique"], itertools.islice(values, 2)))
+
+            # Дисперсія відносно середнього (стійкіше, ніж через AVG(x * x))
+            spread = [column for column in columns if column in numeric and stats[column]["count"] > 1]
+            if spread:
+                parts, spread_params = [], []
+                for column in spread:
+                    name = quote_identifier(column)
+                    parts.append(f"SUM(({name} - ?) * ({name} - ?))")
+                    spread_params += [stats[column]["mean"]] * 2
+                row = connection.execute(f"SELECT {', '.join(parts)} FROM ({inner})", spread_params + params).fetchone()
+                for column, total in zip(spread, row):
+                    stats[column]["std"] = np.sqrt(total / (stats[column]["count"] - 1))
+
+            for column in columns:
+                name = quote_identifier(column)
+                count = stats[column]["count"]
+                if not count:
+                    continue
+                if column in numeric:
+                    # Квартилі з лінійною інтерполяцією, як у pandas
+                    for q in (0.25, 0.5, 0.75):
+                        position = q * (count - 1)
+                        low = int(np.floor(position))
+                        rows = connection.execute(
+                            f"SELECT {name} FROM ({inner}) WHERE {name} IS NOT NULL ORDER BY {name} LIMIT 2 OFFSET ?",
+                            params + [low],
+                        ).fetchall()
+                        value = rows[0][0]
+                        if len(rows) > 1 and position > low:
+                            value += (rows[1][0] - value) * (position - low)
+                        stats[column][f"{q:.0%}"] = value
+                else:
+                    top, freq = connection.execute(
+                        f"SELECT {name}, COUNT(*) AS freq FROM ({inner}) WHERE {name} IS NOT NULL "
+                        f"GROUP BY {name} ORDER BY freq DESC LIMIT 1",
+                        params,
+                    ).fetchone()
+                    stats[column].update(top=top, freq=freq)
+        return pd.DataFrame(stats).reindex(STATISTICS_ROWS).dropna(how="all")
+
+
+class SqlDataProcessor(DataProcessor):
+    """
+    Обробник даних з SQLite. У пам'яті зберігаються лише прочитані сторінки
+    рядків для таблиці; фільтри, статистика, агрегати для графіків і додаток
+    звіту обчислюються запитами до бази.
+    """
+
+    def __init__(self, source, data=None):
+        """
+        :param source: SqliteSource
+        :param data: Уже прочитані рядки (за замовчуванням читається перша сторінка)
+        """
+        fetched = None
+        if data is None:
+            data, fetched = source.fetch(limit=SQL_PAGE_ROWS)
+        super().__init__(data)
+        self.source = source
+        # Кількість рядків результату запиту, вже прочитаних з бази
+        self.offset = len(data) if fetched is None else fetched
+        self.exhausted = fetched is not None and fetched < SQL_PAGE_ROWS
+        self._count = None
+
+    def next_page(self):
+        """
+        Читання наступної сторінки (у фоновому потоці).
+        :return: (рядки, кількість прочитаних з бази рядків) для add_page
+        """
+        return self.source.fetch(offset=self.offset, limit=SQL_PAGE_ROWS)
+
+    def add_page(self, rows, fetched):
+        """
+        Додавання прочитаної сторінки до даних.
+        """
+        self.offset += fetched
+        self.exhausted = fetched < SQL_PAGE_ROWS
+        if not rows.empty:
+            self.append(rows)
+
+    def filtered(self, conditions, cancel_token=None):
+        return SqlDataProcessor(self.source.with_conditions(conditions))
+
+    def count_rows(self):
+        if self._count is None:
+            self._count = self.source.count()
+        return self._count
+
+    def select(self, columns):
+        return self.source.fetch(list(columns))[0]
+
+    def iter_rows(self, columns, size=SQL_PAGE_ROWS):
+        # Додаток читається з бази сторінками, а не одним DataFrame
+        return self.source.pages(columns, size)
+
+    def profile_statistics(self, columns):
+        columns = list(columns)
+        if self.source.residual:
+            return DataProcessor(self.select(columns)).profile_statistics(columns)
+        numeric = [
+            column for column in columns
+            if pd.api.types.is_numeric_dtype(self.data[column]) and not pd.api.types.is_bool_dtype(self.data[column])
+        ]
+        return self.source.statistics(columns, numeric)
+
+    def calculate_statistics(self):
+        return self.profile_statistics(self.data.select_dtypes(include=[np.number]).columns)
+
+    def plot_data(self, token, x_column, y_column, plot_type, limit):
+        """
+        Агрегати для графіка обчислюються базою по перших limit рядках:
+        частоти категорій, суми для кругової діаграми, інтервали гістограми.
+        Для лінійного, стовпчастого і точкового графіків читаються лише два стовпці.
+        """
+        if self.source.residual:
+            data = self.source.fetch(list(dict.fromkeys([x_column, y_column])))[0]
+            return prepare_plot_data(token, data, x_column, y_column, plot_type, limit)
+
+        inner, params = self.source.select_sql(list(dict.fromkeys([x_column, y_column])))
+        inner = f"{inner} LIMIT ?"
+        params.append(limit)
+        x_name, y_name = quote_identifier(x_column), quote_identifier(y_column)
+        x_is_numeric = pd.api.types.is_numeric_dtype(self.data[x_column])
+        y_is_numeric = pd.api.types.is_numeric_dtype(self.data[y_column])
+
+        def counts(column, name):
+            data = self.source.read(
+                f"SELECT {name}, COUNT(*) FROM ({inner}) WHERE {name} IS NOT NULL GROUP BY {name}", params
+            )
+            data.columns = [column, "Кількість"]
+            return data
+
+        if not x_is_numeric or not y_is_numeric:
+            if not x_is_numeric:
+                data = counts(x_column, x_name)
+                if not y_is_numeric:
+                    # Як у prepare_plot_data: частоти значень стовпця кількостей
+                    values = data["Кількість"].value_counts(sort=False)
+                    data = pd.DataFrame({"Кількість": values.values})
+                    x_column = "Кількість"
+            else:
+                data = counts(y_column, y_name)
+                x_column = y_column
+            y_column = "Кількість"
+            if plot_type == "Автоматичний":
+                plot_type = auto_plot_type(data[x_column].nunique(), data[y_column])
+            return data, x_column, y_column, plot_type
+
+        if plot_type == "Автоматичний":
+            distinct = self.source.read(f"SELECT COUNT(DISTINCT {x_name}) FROM ({inner})", params).iloc[0, 0]
+            plot_type = "Кругова діаграма" if distinct < 10 else "Лінійний"
+        token.check()
+
+        if plot_type == "Кругова діаграма":
+            data = self.source.read(
+                f"SELECT {x_name}, SUM({y_name}) FROM ({inner}) WHERE {x_name} IS NOT NULL GROUP BY {x_name}", params
+            )
+            data.columns = [x_column, y_column]
+        elif plot_type == "Гістограма":
+            low, high = self.source.read(f"SELECT MIN({y_name}), MAX({y_name}) FROM ({inner})", params).iloc[0]
+            data = pd.DataFrame({y_column: []})
+            if pd.notna(low):
+                if low == high:
+                    low, high = low - 0.5, high + 0.5
+                width = (high - low) / 10
+                bins = self.source.read(
+                    f"SELECT MIN(CAST(({y_name} - ?) / ? AS INTEGER), 9), COUNT(*) FROM ({inner}) "
+                    f"WHERE {y_name} IS NOT NULL GROUP BY 1",
+                    [float(low), width] + params,
+                )
+                weights = np.zeros(10)
+                weights[bins.iloc[:, 0].to_numpy(dtype=int)] = bins.iloc[:, 1].to_numpy()
+                edges = np.linspace(low, high, 11)
+                data = pd.DataFrame({y_column: (edges[:-1] + edges[1:]) / 2})
+                data.attrs.update(bins=edges, weights=weights)
+        else:
+            data = self.source.read(f"SELECT * FROM ({inner})", params)
+        return data, x_column, y_column, plot_type
+
+
+class Pipeline:
+    """
+    Записана послідовність операцій сесії (очищення, фільтри, вибір стовпців,
+    графіки, звіти) для повторного застосування до нових файлів.
+    """
+
+    def __init__(self, steps=None):
+        self.steps = list(steps or [])
+
+    def record(self, op, **params):
+        """
+        Додавання кроку до запису.
+        :param op: Назва операції ("clean", "filter", "reset", "select_columns", "plot", "report")
+        """
+        step = {"op": op, **params}
+        # Послідовні зміни вибору стовпців зберігаються як один крок
+        if op == "select_columns" and self.steps and self.steps[-1]["op"] == "select_columns":
+            self.steps[-1] = step
+        else:
+            self.steps.append(step)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"version": 1, "steps": self.steps}, file, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as file:
+            return cls(json.load(file)["steps"])
+
+    def unsafe_conditions(self):
+        """
+        Умови фільтрів, які виконуються як довільний код Python (див. FilterCondition.is_safe).
+        :return: Список текстів умов
+        """
+        return [
+            step["condition"] for step in self.steps
+            if step["op"] == "filter" and not FilterCondition.is_safe(step["condition"])
+        ]
+
+    def has_outputs(self):
+        return any(step["op"] in ("plot", "report") for step in self.steps)
+
+    def required_columns(self):
+        """
+        Стовпці, які потрібні для відтворення. Очищення видаляє дублікати
+        за всіма стовпцями, тому тоді відкидати стовпці при читанні не можна.
+        :return: Список стовпців або None (потрібні всі)
+        """
+        columns = []
+        for step in self.steps:
+            op = step["op"]
+            if op == "clean" or (op == "report" and not step.get("columns")):
+                return None
+            if op == "filter":
+                columns.append(step["column"])
+            elif op in ("select_columns", "report"):
+                columns.extend(step["columns"])
+            elif op == "plot":
+                columns.extend([step["x_column"], step["y_column"]])
+        if not columns:
+            return None
+        return list(dict.fromkeys(columns))
+
+    def compile(self):
+        """
+        Оптимізований план: сусідні фільтри зливаються в один крок.
+        :return: Список кроків плану
+        """
+        plan = []
+        for step in self.steps:
+            if step["op"] == "filter":
+                if plan and plan[-1]["op"] == "filters":
+                    plan[-1]["conditions"].append((step["column"], step["condition"]))
+                else:
+                    plan.append({"op": "filters", "conditions": [(step["column"], step["condition"])]})
+            else:
+                plan.append(step)
+        return plan
+
+    def run(self, file_path, output_dir=None, cancel_token=None):
+        """
+        Відтворення записаних операцій на новому файлі.
+        :param file_path: Шлях до файлу з даними
+        :param output_dir: Тека для графіків і звітів
+        :param cancel_token: CancelToken (необов'язковий)
+        :return: PipelineResult
+        """
+        return self.apply(read_table_file(file_path, usecols=self.required_columns()), output_dir, cancel_token)
+
+    def apply(self, original_data, output_dir=None, cancel_token=None):
+        """
+        Відтворення записаних операцій на вже прочитаних даних.
+        :param original_data: DataFrame з даними
+        :param output_dir: Тека для графіків і звітів (без неї графіки і звіти пропускаються)
+        :param cancel_token: CancelToken (необов'язковий)
+        :return: PipelineResult
+        """
+        result = PipelineResult()
+        result.original_data = original_data
+        data = result.original_data
+        for step in self.compile():
+            if cancel_token is not None:
+                cancel_token.check()
+            op = step["op"]
+            if op == "filters":
+                data = DataProcessor(data).filter_many(
+                    [(column, FilterCondition(condition)) for column, condition in step["conditions"]],
+                    cancel_token,
+                )
+                result.active_filters.extend(step["conditions"])
+            elif op == "clean":
+                processor = DataProcessor(data.copy())
+                processor.clean_data()
+                data = processor.data
+            elif op == "reset":
+                data = result.original_data
+                result.active_filters = []
+            elif op == "select_columns":
+                result.selected_columns = list(step["columns"])
+            elif op == "plot" and output_dir:
+                prepared = prepare_plot_data(
+                    cancel_token or CancelToken(), data,
+                    step["x_column"], step["y_column"], step["plot_type"], step["limit"],
+                )
+                path = unique_file_path(
+                    output_dir, f"{step['x_column']}_{step['y_column']}_{step['plot_type']}", "png"
+                )
+                result.chart_files.append(render_plot_file(path, *prepared))
+            elif op == "report" and output_dir:
+                path = unique_file_path(output_dir, "report", "pdf")
+                # Статистика обчислюється лише для стовпців звіту
+                DataProcessor(data).generate_report(
+                    path, step["columns"] or None, step["include_graphics"], list(result.chart_files),
+                    step.get("include_appendix", False), cancel_token,
+                )
+                result.report_files.append(path)
+        result.data = data
+        return result
+
+
+class PipelineResult:
+    """
+    Результат відтворення конвеєра.
+    """
+
+    def __init__(self):
+        self.original_data = None
+        self.data = None
+        self.active_filters = []
+        self.selected_columns = []
+        self.chart_files = []
+        self.report_files = []
+
+
+class SessionState:
+    """
+    Робочий стан сесії для збереження та відновлення.
+    """
+
+    def __init__(self):
+        self.original_data = None
+        self.data = None
+        self.source_path = None
+        self.is_preview = False
+        self.selected_columns = []
+        self.active_filters = []
+        self.edit_log = []
+        self.pipeline_steps = []
+
+
+def _write_column(directory, stem, values):
+    """
+    Запис стовпця (або індексу) у файли .npy без pickle: числові, логічні та
+    дати - як є (відкриваються через memory mapping), рядки - буфером UTF-8 зі
+    зміщеннями, категорії - кодами, типи з пропусками - значеннями з маскою.
+    Значення інших типів в об'єктних стовпцях зберігаються як текст.
+    :param stem: Префікс імен файлів стовпця
+    :param values: Series або Index
+    :return: Опис стовпця для маніфесту
+    """
+    def save(suffix, array):
+        np.save(os.path.join(directory, f"{stem}{suffix}.npy"), array, allow_pickle=False)
+        return f"{stem}{suffix}.npy"
+
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufmM":
+        return {"kind": "array", "file": save("", np.asarray(values))}
+    if isinstance(dtype, pd.CategoricalDtype):
+        return {
+            "kind": "category",
+            "file": save("", np.asarray(values.codes if isinstance(values, pd.Index) else values.cat.codes)),
+            "categories": _write_column(directory, f"{stem}_categories", dtype.categories),
+            "ordered": bool(dtype.ordered),
+        }
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        naive = values.tz_convert(None) if isinstance(values, pd.Index) else values.dt.tz_convert(None)
+        return {"kind": "datetimetz", "file": save("", np.asarray(naive)), "tz": str(dtype.tz)}
+    mask = np.asarray(pd.isna(values))
+    if pd.api.types.is_extension_array_dtype(dtype) and dtype.kind in "biuf":
+        # Nullable Int64, Float64, boolean: значення з нулями на місці пропусків і маска
+        filled = np.asarray(values.to_numpy(dtype=dtype.numpy_dtype, na_value=0))
+        return {"kind": "masked", "file": save("", filled), "mask": save("_mask", mask), "dtype": str(dtype)}
+
+    # Рядки та об'єкти: увесь текст одним буфером UTF-8 і зміщення кінців значень (у символах)
+    strings = ["" if missing else str(value) for value, missing in zip(values, mask)]
+    offsets = np.cumsum(np.fromiter(map(len, strings), dtype=np.int64, count=len(strings)))
+    return {
+        "kind": "string",
+        "file": save("", np.frombuffer("".join(strings).encode("utf-8", "surrogatepass"), dtype=np.uint8)),
+        "offsets": save("_offsets", offsets),
+        "mask": save("_mask", mask),
+        "dtype": "object" if dtype == object else str(dtype),
+    }
+
+
+def _read_column(directory, column):
+    """
+    Відновлення стовпця, записаного _write_column (np.load без pickle).
+    :return: Масив значень
+    """
+    def load(name, mmap_mode=None):
+        return np.load(os.path.join(directory, name), mmap_mode=mmap_mode, allow_pickle=False)
+
+    kind = column["kind"]
+    if kind == "array":
+        return load(column["file"], mmap_mode="r")
+    if kind == "category":
+        categories = _read_column(directory, column["categories"])
+        return pd.Categorical.from_codes(load(column["file"]), categories=categories, ordered=column["ordered"])
+    if kind == "datetimetz":
+        return pd.DatetimeIndex(load(column["file"])).tz_localize("UTC").tz_convert(column["tz"]).array
+    mask = load(column["mask"])
+    if kind == "masked":
+        array = pd.array(load(column["file"]), dtype=column["dtype"])
+        array[mask] = pd.NA
+        return array
+
+    text = load(column["file"]).tobytes().decode("utf-8", "surrogatepass")
+    ends = load(column["offsets"]).tolist()
+    values = np.empty(len(ends), dtype=object)
+    values[:] = [text[start:end] for start, end in zip([0] + ends[:-1], ends)]
+    values[mask] = np.nan
+    return values if column["dtype"] == "object" else pd.array(values, dtype=column["dtype"])
+
+
+def _write_frame(directory, data):
+    """
+    Запис DataFrame по стовпцях у файли .npy (див. _write_column); числові
+    стовпці при відкритті відображаються у пам'ять.
+    :return: Опис стовпців та індексу для маніфесту
+    """
+    os.makedirs(directory)
+    columns = []
+    for i, col in enumerate(data.columns):
+        columns.append({"name": col, **_write_column(directory, str(i), data.iloc[:, i])})
+
+    if isinstance(data.index, pd.RangeIndex):
+        index = {"start": data.index.start, "stop": data.index.stop, "step": data.index.step}
+    else:
+        index = {"values": _write_column(directory, "index", data.index), "name": data.index.name}
+    return {"columns": columns, "index": index}
+
+
+def _read_frame(directory, layout):
+    """
+    Відновлення DataFrame, записаного _write_frame, без копіювання числових стовпців.
+    """
+    arrays = {i: _read_column(directory, column) for i, column in enumerate(layout["columns"])}
+
+    if "values" in layout["index"]:
+        index = pd.Index(_read_column(directory, layout["index"]["values"]), name=layout["index"]["name"])
+    else:
+        index = pd.RangeIndex(**layout["index"])
+    data = pd.DataFrame(arrays, index=index, copy=False)
+    data.columns = [column["name"] for column in layout["columns"]]
+    return data
+
+
+def apply_edit_log(data, edit_log):
+    """
+    Повторне застосування журналу редагувань до даних.
+    :param edit_log: Список записів {"row": мітка рядка, "column": стовпець, "value": значення}
+    """
+    processor = DataProcessor(data)
+    positions = data.index.get_indexer([edit["row"] for edit in edit_log])
+    for position, edit in zip(positions, edit_log):
+        if position >= 0:
+            processor.update_cell(position, edit["column"], edit["value"])
+    return processor.data
+
+
+def save_session(path, state):
+    """
+    Збереження знімка сесії у теку path. Поточні дані, якщо це можливо,
+    зберігаються як масив номерів рядків оригінальних даних плюс журнал
+    редагувань, інакше - повністю.
+    :param path: Шлях до теки сесії
+    :param state: SessionState
+    """
+    if os.path.exists(path):
+        if not os.path.exists(os.path.join(path, "manifest.json")):
+            raise ValueError(f"{path} існує і не є збереженою сесією.")
+        shutil.rmtree(path)
+    os.makedirs(path)
+
+    manifest = {
+        "version": 1,
+        "source_path": state.source_path,
+        "is_preview": state.is_preview,
+        "selected_columns": list(state.selected_columns),
+        "active_filters": [list(item) for item in state.active_filters],
+        "edit_log": state.edit_log,
+        "pipeline": state.pipeline_steps,
+        "original": _write_frame(os.path.join(path, "original"), state.original_data),
+        "data": None,
+    }
+
+    # Перевірка, чи поточні дані - це підмножина оригінальних рядків з редагуваннями
+    positions = None
+    if state.original_data.index.is_unique and list(state.data.columns) == list(state.original_data.columns):
+        positions = state.original_data.index.get_indexer(state.data.index)
+        if (positions < 0).any():
+            positions = None
+        else:
+            candidate = apply_edit_log(state.original_data.take(positions), state.edit_log)
+            if not candidate.equals(state.data):
+                positions = None
+
+    if positions is not None:
+        np.save(os.path.join(path, "filter_index.npy"), positions)
+    else:
+        manifest["data"] = _write_frame(os.path.join(path, "data"), state.data)
+
+    # Маніфест записується останнім: незавершений знімок не відкриється
+    with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, ensure_ascii=False, default=lambda o: o.item() if isinstance(o, np.generic) else str(o))
+
 
-    def filter_data(self, column, condition):
-        """
-        Фільтрація даних за вказаним стовпцем і умовою.
-        :param column: Назва стовпця
-        :param condition: Функція умови для фільтрації
-        :return: Відфільтровані дані
-        """
-        if column not in self.data.columns:
-            raise ValueError(f"Стовпець {column} відсутній у даних.")
-        return self.data[self.data[column].apply(condition)]
+def load_session(path):
+    """
+    Відкриття знімка сесії. Числові стовпці оригінальних даних
+    відображаються у пам'ять (memory mapping) і читаються з диска за потреби.
+    :param path: Шлях до теки сесії
+    :return: SessionState
+    """
+    with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as file:
+        manifest = json.load(file)
 
-    def clean_data(self):
-        """
-        Очищення даних:
-        - Заповнення відсутніх значень середнім.
-        - Видалення дублювань.
-        :return: Очищені дані
-        """
-        self.data.fillna(self.data.mean(numeric_only=True), inplace=True)
-        self.data.drop_duplicates(inplace=True)
+    state = SessionState()
+    state.source_path = manifest["source_path"]
+    state.is_preview = manifest["is_preview"]
+    state.selected_columns = manifest["selected_columns"]
+    state.active_filters = [tuple(item) for item in manifest["active_filters"]]
+    state.edit_log = manifest["edit_log"]
+    state.pipeline_steps = manifest["pipeline"]
+    state.original_data = _read_frame(os.path.join(path, "original"), manifest["original"])
 
-    def calculate_statistics(self):
-        """
-        Обчислення базової статистики для числових стовпців.
-        :return: DataFrame зі статистикою
-        """
-        stats = self.data.describe(include=[np.number])
-        return stats
+    if manifest["data"] is None:
+        positions = np.load(os.path.join(path, "filter_index.npy"))
+        state.data = apply_edit_log(state.original_data.take(positions), state.edit_log)
+    else:
+        state.data = _read_frame(os.path.join(path, "data"), manifest["data"]).copy()
+    return state
 
-    
-    def generate_report(self, output_path, selected_columns=None, include_graphics=True):
-        """
-        Генерація звіту у форматі PDF.
-        :param output_path: Шлях до файлу звіту.
-        :param selected_columns: Вибрані стовпці для звіту (за замовчуванням - всі).
-        :param include_graphics: Чи включати графіки у звіт.
-        """
-        from tkinter import filedialog
 
-        pdf = FPDF()
-        pdf.add_page()
+def frame_footprint(data):
+    """
+    Оцінка пам'яті, яку займає DataFrame. Числові стовпці рахуються точно,
+    текстові - за вибіркою рядків, стовпці, відкриті з диску через memory
+    mapping, не рахуються.
+    """
+    size = int(data.index.memory_usage())
+    step = max(1, len(data) // 1000)
+    for i in range(data.shape[1]):
+        series = data.iloc[:, i]
+        if pd.api.types.is_string_dtype(series.dtype) or series.dtype == object:
+            sample = series.iloc[::step]
+            size += int(sample.memory_usage(index=False, deep=True) * len(series) / max(len(sample), 1))
+        elif not _is_mapped(series):
+            size += int(series.memory_usage(index=False))
+    return size
 
-        # Підключення шрифту DejaVuSans для підтримки Unicode
-        font_path = "fonts/DejaVuSans-Bold.ttf"
-        if not os.path.exists(font_path):
-            print("Шрифт не знайдений!")
-            return
 
-        pdf.add_font("DejaVu", "", font_path, uni=True)
-        pdf.set_font("DejaVu", size=12)
+def _is_mapped(series):
+    if not isinstance(series.dtype, np.dtype):
+        return False
+    base = series.to_numpy()
+    while base is not None:
+        if isinstance(base, np.memmap):
+            return True
+        base = getattr(base, "base", None)
+    return False
 
-        # Заголовок
-        pdf.set_font("DejaVu", size=16)
-        pdf.cell(200, 10, txt="Звіт про дані", ln=True, align="C")
-        pdf.ln(10)
 
-        # Вибір стовпців (якщо користувач нічого не вибрав, використовуються всі)
-        if selected_columns is None:
-            selected_columns = self.data.columns
+def estimate_footprint(obj, depth=4):
+    """
+    Наближений розмір об'єкта в пам'яті: таблиць, масивів, кешів профілів
+    та індексів, графіків matplotlib (за розміром растрового буфера).
+    """
+    if isinstance(obj, pd.DataFrame):
+        return frame_footprint(obj)
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage())
+    if isinstance(obj, np.ndarray):
+        return 0 if isinstance(obj, np.memmap) else obj.nbytes
+    if hasattr(obj, "get_size_inches"):
+        width, height = obj.get_size_inches() * obj.dpi
+        return int(width * height * 4)
+    if depth == 0:
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_footprint(value, depth - 1) for value in obj.values())
+    if isinstance(obj, (list, tuple, set)):
+        return sys.getsizeof(obj) + sum(estimate_footprint(value, depth - 1) for value in obj)
+    if hasattr(obj, "__dict__"):
+        return sum(estimate_footprint(value, depth - 1) for value in vars(obj).values())
+    return sys.getsizeof(obj)
 
-        # Фільтрування даних за вибраними стовпцями
-        filtered_data = self.data[selected_columns]
 
-        # Базова статистика
-        pdf.set_font("DejaVu", size=12)
-        pdf.cell(200, 10, txt="Базова статистика:", ln=True)
-        pdf.ln(5)
+class MemoryEntry:
+    def __init__(self, obj, size, spillable, version=None):
+        self.obj = obj
+        self.size = size
+        self.spillable = spillable
+        # Версія даних, для якої обчислено size (None - перераховувати щоразу)
+        self.version = version
+        self.last_used = time.monotonic()
+        # Тека з вивантаженою таблицею та її опис (_write_frame)
+        self.directory = None
+        self.layout = None
 
-        stats = filtered_data.describe(include="all")  # Генерація статистики
-        col_width = 45  # Ширина стовпців у таблиці
-        row_height = 8  # Висота рядків у таблиці
-        page_width = pdf.w - 35  # Ширина сторінки (з урахуванням відступів)
-        max_cols_per_page = int(page_width // col_width)  # Максимальна кількість стовпців на сторінці
-        max_rows_per_page = int((pdf.h - 40) // row_height)
-        # Розбиття таблиці на частини, якщо стовпці не вміщуються
-        pdf.set_font("DejaVu", size=10)
-        for start_col in range(0, len(stats.columns), max_cols_per_page):
-            end_col = start_col + max_cols_per_page
-            subset_columns = stats.columns[start_col:end_col]
 
-            # Заголовок таблиці
-            pdf.cell(col_width, row_height, txt="Параметр", border=1, align="C")
-            for col in subset_columns:
-                pdf.cell(col_width, row_height, txt=str(col), border=1, align="C")
-            pdf.ln(row_height)
+class MemoryGovernor:
+    """
+    Бюджет пам'яті програми: облік розміру даних, кешів і графіків та
+    вивантаження холодних таблиць на диск. Вивантажена таблиця при першому
+    зверненні відкривається з диску через memory mapping, тож числові
+    стовпці не займають пам'ять, доки їх не скопіюють.
+    """
 
-            # Дані таблиці
-            for index, row in stats.iterrows():
-                if pdf.get_y() + row_height > pdf.h - 20 :
-                    pdf.add_page()
-                    pdf.cell(col_width, row_height, txt="Параметр", border=1, align="C")
-                    for col in subset_columns:
-                        pdf.cell(col_width, row_height, txt=str(col), border=1, align="C")
-                    pdf.ln(row_height)
+    def __init__(self, budget):
+        """
+        :param budget: Бюджет пам'яті (байти)
+        """
+        self.budget = budget
+        self.entries = {}
+        self.spill_dir = None
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
 
-                pdf.cell(col_width, row_height, txt=str(index), border=1)
-                for col in subset_columns:
-                    value = row[col]
-                    cell_value = f"{value:.2f}" if pd.api.types.is_numeric_dtype(value) else str(value)
-                    pdf.cell(col_width, row_height, txt=cell_value, border=1)
-                pdf.ln(row_height)
+    def track(self, name, obj, spillable=False, version=None):
+        """
+        Облік об'єкта під іменем name (None - об'єкт більше не утримується).
+        :param spillable: Таблицю можна вивантажити на диск
+        :param version: Версія даних об'єкта; розмір того самого об'єкта з тією
+                        самою версією не перераховується
+        """
+        entry = self.entries.get(name)
+        if entry is not None and entry.obj is obj and obj is not None:
+            if version is None or entry.version != version:
+                entry.size = estimate_footprint(obj)
+                entry.version = version
+            return
+        if entry is not None and entry.directory:
+            shutil.rmtree(entry.directory, ignore_errors=True)
+        if obj is None:
+            self.entries.pop(name, None)
+        else:
+            self.entries[name] = MemoryEntry(obj, estimate_footprint(obj), spillable, version)
 
-            # Перехід на нову сторінку для наступної частини таблиці
-            pdf.ln(5)
-            #pdf.add_page()
+    def get(self, name):
+        """
+        Об'єкт за іменем; вивантажена таблиця відкривається з диску.
+        """
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        entry.last_used = time.monotonic()
+        if entry.obj is None:
+            entry.obj = _read_frame(entry.directory, entry.layout)
+            entry.size = estimate_footprint(entry.obj)
+        return entry.obj
 
-        # Додавання графіків
-        if include_graphics:
-            pdf.add_page()
-            pdf.set_font("DejaVu", size=14)
-            pdf.cell(200, 10, txt="Графіки:", ln=True)
-            pdf.ln(10)
+    def used(self):
+        """
+        Обсяг пам'яті всіх об'єктів, що не вивантажені на диск (байти).
+        """
+        return sum(entry.size for entry in self.entries.values() if entry.obj is not None)
 
-            # Запит у користувача на вибір файлів із графіками
-            image_files = filedialog.askopenfilenames(
-                title="Оберіть файли графіків",
-                filetypes=[("Зображення", "*.png;*.jpg;*.jpeg;*.bmp")],
-            )
+    def spill_candidates(self, idle=MEMORY_COLD_SECONDS):
+        """
+        Холодні таблиці (у порядку давності звернення), вивантаження яких
+        повертає використання пам'яті в межі бюджету.
+        :param idle: Мінімальний час без звернень (секунди)
+        :return: Список імен
+        """
+        excess = self.used() - self.budget
+        now = time.monotonic()
+        names = []
+        for name, entry in sorted(self.entries.items(), key=lambda item: item[1].last_used):
+            if excess <= 0:
+                break
+            if entry.spillable and entry.obj is not None and entry.size > 0 and now - entry.last_used >= idle:
+                names.append(name)
+                excess -= entry.size
+        return names
 
-            for image_path in image_files:
-                try:
-                    pdf.image(image_path, x=10, y=pdf.get_y(), w=170)
-                    pdf.ln(130)
-                except Exception as e:
-                    print(f"Не вдалося додати графік {image_path}: {e}")
+    def write(self, name, data):
+        """
+        Запис таблиці у тимчасову теку (виконується у фоновому потоці).
+        :return: (тека, опис таблиці) для release
+        """
+        with self._lock:
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix="pdgui-spill-")
+            directory = os.path.join(self.spill_dir, f"{name}-{next(self._counter)}")
+        return directory, _write_frame(directory, data)
+
+    def release(self, name, data, spilled=None):
+        """
+        Звільнення пам'яті таблиці після запису на диск.
+        :param data: Таблиця, що записувалась (якщо її вже замінено, запис видаляється)
+        :param spilled: Результат write або None, якщо таблиця вже є на диску
+        :return: Чи звільнено пам'ять
+        """
+        entry = self.entries.get(name)
+        if entry is None or entry.obj is not data:
+            if spilled is not None:
+                shutil.rmtree(spilled[0], ignore_errors=True)
+            return False
+        if spilled is not None:
+            entry.directory, entry.layout = spilled
+        entry.obj = None
+        entry.size = 0
+        return True
+
+    def close(self):
+        """
+        Видалення тимчасових файлів.
+        """
+        if self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
 
-        # Збереження звіту
-        pdf.output(output_path, "F")
-        print(f"Звіт збережено у файл: {output_path}")
 
 class DataLoaderApp:
     def __init__(self, root):
@@ -147,14 +2592,52 @@ class DataLoaderApp:
         self.root.geometry("800x600")
         self.root.minsize(800,600)
 
+        # Облік пам'яті; холодні таблиці вивантажуються на диск
+        self.memory = MemoryGovernor(MEMORY_BUDGET_MB * 1024 * 1024)
+        self.memory_job = None
+
         # Змінна для збереження даних
         self.data = None
         self.original_data = None
         self.processor = None
         self.selected_columns = set()
+        # Шлях до відкритого файлу та ознака режиму попереднього перегляду
+        self.source_path = None
+        self.source_size = 0
+        self.is_preview = False
+        # Джерело SQLite (якщо дані відкрито з бази)
+        self.sql_source = None
+        self.base_profiles = {}
+        # Сортовані індекси оригінальних даних (зберігаються після скидання фільтрів)
+        self.base_indexes = {}
+        # Запис операцій сесії
+        self.pipeline = Pipeline()
+        # Віртуалізація стовпців таблиці: відображається лише вікно стовпців
+        self.table_data = None
+        self.col_offset = 0
+        self.visible_count = 0
+        self.render_generation = 0
+        self.rendered_generation = np.zeros(0, dtype=np.int64)
+        self.refresh_job = None
+        # Пул віджетів панелі редагування (мітка, поле вводу)
+        self.editor_rows = []
+        self.selected_item = ()
+        # Журнал редагувань комірок поточних даних
+        self.edit_log = []
+        # Файли графіків, побудованих для поточних даних (пропонуються для звітів)
+        self.chart_files = []
+        # Активні фільтри (стовпець, умова) - застосовуються і до дописаних рядків
+        self.active_filters = []
+        # Режим стеження за файлом
+        self.follower = None
+        self.follow_job = None
+        self.follow_var = tk.BooleanVar(value=False)
+        # Фонові завдання
+        self.scheduler = TaskScheduler(self.root, on_status=self.update_task_status)
         # Інтерфейс
         self.is_dark_mode = False
         self.create_widgets(self.root)
+        self.update_memory()
         self.setup_edit_frame()
         self.setup_processing_widgets()
         #self.open_processing_window()
@@ -165,7 +2648,129 @@ class DataLoaderApp:
         self.root.rowconfigure(1, weight=1)
     
         self.tree.bind("<Control-Button-1>", self.on_column_select)
-        
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        """
+        Зупинка фонових завдань і закриття програми.
+        """
+        self.stop_follow()
+        if self.memory_job is not None:
+            self.root.after_cancel(self.memory_job)
+        self.scheduler.shutdown()
+        self.memory.close()
+        self.root.destroy()
+
+    @property
+    def original_data(self):
+        # Оригінальні дані можуть бути вивантажені на диск - відкриваються при зверненні
+        return self.memory.get("original_data")
+
+    @original_data.setter
+    def original_data(self, data):
+        self.memory.track("original_data", data, spillable=True)
+
+    def update_memory(self):
+        """
+        Періодичний облік пам'яті даних, кешів і графіків. Якщо бюджет
+        перевищено, холодні таблиці вивантажуються на диск у фоні.
+        """
+        self.memory_job = self.root.after(MEMORY_POLL_MS, self.update_memory)
+        processor = self.processor
+        # Таблиці змінюються на місці лише через DataProcessor.update_cell, що змінює
+        # версію, тож розмір тієї самої таблиці тієї самої версії не перераховується
+        version = processor.version if processor is not None else 0
+        self.memory.track("data", self.data, version=version)
+        self.memory.track(
+            "table_data", self.table_data if self.table_data is not self.data else None, version=version
+        )
+        if processor is not None and processor.data is not self.data:
+            self.memory.track("processor_data", processor.data, version=version)
+        else:
+            self.memory.track("processor_data", None)
+        self.memory.track("base_profiles", self.base_profiles)
+        self.memory.track("base_indexes", self.base_indexes)
+        shared = processor is None or processor.profiles is self.base_profiles
+        self.memory.track("profiles", None if shared else processor.profiles)
+        shared = processor is None or processor.indexes is self.base_indexes
+        self.memory.track("indexes", None if shared else processor.indexes)
+        from matplotlib._pylab_helpers import Gcf
+        figures = [manager.canvas.figure for manager in Gcf.get_all_fig_managers()]
+        preview = getattr(self, "plot_preview_widget", None)
+        if preview is not None:
+            figures.append(preview.figure)
+        self.memory.track("figures", figures)
+
+        for name in self.memory.spill_candidates():
+            if f"spill-{name}" not in self.scheduler.tasks:
+                self.spill(name)
+
+        used, budget = self.memory.used(), self.memory.budget
+        text = f"Пам'ять: {used / 2 ** 20:.0f} / {budget / 2 ** 20:.0f} МБ"
+        self.memory_label.config(text=text + (" (перевищено)" if used > budget else ""))
+
+    def spill(self, name):
+        """
+        Вивантаження таблиці на диск у фоновому потоці.
+        :param name: Ім'я таблиці в обліку пам'яті
+        """
+        entry = self.memory.entries[name]
+        data = entry.obj
+        if entry.directory:
+            # Таблиця вже є на диску - достатньо звільнити пам'ять
+            self.memory.release(name, data)
+            return
+        self.scheduler.submit(
+            f"spill-{name}",
+            lambda token: self.memory.write(name, data),
+            on_done=lambda spilled: self.memory.release(name, data, spilled),
+            on_error=lambda e: None,
+            description="вивантаження на диск",
+            cancellable=False,
+        )
+
+    def set_memory_budget(self):
+        """
+        Зміна бюджету пам'яті.
+        """
+        budget = simpledialog.askinteger(
+            "Бюджет пам'яті",
+            "Бюджет пам'яті (МБ):",
+            initialvalue=self.memory.budget // 2 ** 20,
+            minvalue=64,
+            parent=self.root,
+        )
+        if budget:
+            self.memory.budget = budget * 2 ** 20
+            self.update_memory_now()
+
+    def update_memory_now(self):
+        """
+        Позачерговий облік пам'яті (після зміни бюджету).
+        """
+        if self.memory_job is not None:
+            self.root.after_cancel(self.memory_job)
+        self.update_memory()
+
+    def update_task_status(self, descriptions):
+        """
+        Оновлення індикатора фонових завдань.
+        :param descriptions: Описи активних завдань
+        """
+        if descriptions:
+            self.task_label.config(text=f"Виконується ({len(descriptions)}): " + ", ".join(descriptions))
+            cancellable = any(task.cancellable for task in self.scheduler.tasks.values())
+            self.cancel_tasks_button.config(state="normal" if cancellable else "disabled")
+        else:
+            self.task_label.config(text="Немає активних завдань")
+            self.cancel_tasks_button.config(state="disabled")
+
+    def on_task_error(self, title):
+        """
+        Обробник помилок фонових завдань.
+        :param title: Текст повідомлення перед описом помилки
+        """
+        return lambda e: messagebox.showerror("Помилка", f"{title}: {e}")
 
     def create_widgets(self, root):
         # Заголовок таблиці
@@ -177,24 +2782,59 @@ class DataLoaderApp:
         
     
         # Скролбар для таблиці
-        scrollbar_y = ttk.Scrollbar(self.root, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar_y.set)
-        scrollbar_y.grid(row=1, column=0, sticky="ens",)
+        self.scrollbar_y = ttk.Scrollbar(self.root, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscroll=self.on_tree_yscroll)
+        self.scrollbar_y.grid(row=1, column=0, sticky="ens",)
 
-        scrollbar_x = ttk.Scrollbar(self.root, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(xscroll=scrollbar_x.set)
-        scrollbar_x.grid(row=1, column=0, sticky="wes",)
+        # Горизонтальна прокрутка зсуває вікно видимих стовпців
+        self.scrollbar_x = ttk.Scrollbar(self.root, orient="horizontal", command=self.on_xscroll)
+        self.scrollbar_x.grid(row=1, column=0, sticky="wes",)
+        self.tree.bind("<Shift-MouseWheel>", lambda e: self.on_xscroll("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Configure>", self.on_tree_resize)
 
         self.tree.bind('<<TreeviewSelect>>', self.edit_selected_item)
 
+        # Рядок стану
+        self.status_label = tk.Label(self.root, text="", anchor="w")
+        self.status_label.grid(row=3, column=0, sticky="ew", padx=10)
+
+        # Індикатор фонових завдань
+        self.task_frame = tk.Frame(self.root)
+        self.task_frame.grid(row=3, column=1, sticky="e", padx=10)
+        self.task_label = tk.Label(self.task_frame, text="Немає активних завдань", anchor="e")
+        self.task_label.grid(row=0, column=0, sticky="e")
+        self.cancel_tasks_button = tk.Button(
+            self.task_frame, text="Скасувати", command=self.scheduler.cancel_all, state="disabled"
+        )
+        self.cancel_tasks_button.grid(row=0, column=1, padx=5)
+        self.memory_label = tk.Label(self.task_frame, text="", anchor="e")
+        self.memory_label.grid(row=0, column=2, sticky="e")
+
         self.mainmenu = tk.Menu(self.root)
         self.root.config(menu=self.mainmenu)
-        filemenu = tk.Menu(self.mainmenu, tearoff = 0)
-        filemenu.add_command(label="Відкрити", command=self.load_data)
-        filemenu.add_command(label="Зберегти", command=self.save_data)
-        self.mainmenu.add_cascade(label="Файл", menu=filemenu)
+        self.filemenu = tk.Menu(self.mainmenu, tearoff = 0)
+        self.filemenu.add_command(label="Відкрити", command=self.load_data)
+        self.filemenu.add_command(label="Відкрити SQLite", command=self.open_sqlite)
+        self.filemenu.add_command(label="Попередній перегляд", command=lambda: self.preview_data("head"))
+        self.filemenu.add_command(label="Попередній перегляд (випадкова вибірка)", command=lambda: self.preview_data("reservoir"))
+        self.filemenu.add_command(label="Завантажити повністю", command=self.load_full_data, state="disabled")
+        self.filemenu.add_checkbutton(label="Стежити за файлом", variable=self.follow_var, command=self.toggle_follow)
+        self.filemenu.add_command(label="Зберегти", command=self.save_data)
+        self.filemenu.add_separator()
+        self.filemenu.add_command(label="Зберегти сесію", command=self.save_session)
+        self.filemenu.add_command(label="Відкрити сесію", command=self.open_session)
+        self.filemenu.add_separator()
+        self.filemenu.add_command(label="Бюджет пам'яті", command=self.set_memory_budget)
+        self.mainmenu.add_cascade(label="Файл", menu=self.filemenu)
+
+        pipelinemenu = tk.Menu(self.mainmenu, tearoff=0)
+        pipelinemenu.add_command(label="Зберегти конвеєр", command=self.save_pipeline)
+        pipelinemenu.add_command(label="Відтворити конвеєр", command=self.replay_pipeline)
+        pipelinemenu.add_command(label="Очистити запис", command=lambda: self.pipeline.steps.clear())
+        self.mainmenu.add_cascade(label="Конвеєр", menu=pipelinemenu)
 
         self.mainmenu.add_command(label="Темний режим", command=self.toggle_theme)
+        self.theme_menu_index = self.mainmenu.index("end")
 
         self.mainmenu.add_command(label="Довідка", command=self.open_help_window)
         
@@ -229,6 +2869,9 @@ class DataLoaderApp:
         )
         filter_button.grid(row=3, column=1, padx=10, pady=5, sticky="w")
 
+        index_button = tk.Button(self.processing_frame, text="Індексувати стовпець", command=self.index_column)
+        index_button.grid(row=3, column=2, padx=10, pady=5, sticky="w")
+
         reset_button = tk.Button(self.processing_frame, text="Скинути фільтри", command=self.reset_filters)
         reset_button.grid(row=3, column=0, pady=10, sticky="w")
 
@@ -237,6 +2880,9 @@ class DataLoaderApp:
 
         self.plot_button = tk.Button(self.processing_frame, text="Побудувати графік", command=self.plot_selected_columns)
         self.plot_button.grid(row=4, column=1,sticky="w")
+
+        batch_button = tk.Button(self.processing_frame, text="Пакет графіків", command=self.batch_charts)
+        batch_button.grid(row=4, column=2, sticky="w")
         
 
     def setup_processing_widgets_data_loadet(self):
@@ -244,97 +2890,402 @@ class DataLoaderApp:
         processing_frame = tk.Label(self.processing_frame, text="Обробка даних", font=("Arial", 10, "bold"))
         processing_frame.grid(row=2, column= 0 ,  sticky="ns", padx=10, pady=10)
 
-        self.column_combo = ttk.Combobox(
-            self.processing_frame, values=list(self.data.columns), state="readonly"
+        # При повторному завантаженні лише оновлюємо список стовпців
+        if hasattr(self, "column_combo"):
+            self.column_combo.configure(values=list(self.data.columns))
+            if self.column_combo.get() not in self.data.columns:
+                self.column_combo.set("")
+            return
+
+        self.column_combo = ttk.Combobox(
+            self.processing_frame, values=list(self.data.columns), state="readonly"
+        )
+        self.column_combo.grid(row=2, column=1, padx=10, pady=5, sticky="w")
+
+        self.column_combo.bind("<<ComboboxSelected>>", self.suggest_filters)
+
+        # Поле умови з підказками на основі профілю стовпця
+        self.condition_entry = ttk.Combobox(self.processing_frame, values=[])
+        self.condition_entry.grid(row=2, column=2, padx=10, pady=5, sticky="w")
+
+    def suggest_filters(self, event=None):
+        """
+        Заповнює підказки умов фільтрації для вибраного стовпця
+        (квантилі для числових стовпців, найчастіші значення для інших).
+        """
+        column = self.column_combo.get()
+        if not column or self.processor is None:
+            return
+
+        def build(token, processor):
+            profile = processor.profile(column)
+            if profile.is_numeric and profile.count:
+                q25, q50, q75 = (profile.quantile(q) for q in (0.25, 0.5, 0.75))
+                return [
+                    f"x<={q50:.6g}",
+                    f"x>{q50:.6g}",
+                    f"x>={q25:.6g} and x<={q75:.6g}",
+                    f"x>={profile.min:.6g} and x<={profile.max:.6g}",
+                ]
+            return [f"x=={literal}" for literal in map(self.filter_literal, profile.top(10).index) if literal]
+
+        self.scheduler.submit(
+            "suggest",
+            build,
+            self.processor,
+            on_done=lambda values: self.condition_entry.configure(values=values),
+            on_error=lambda e: None,
+            description="профіль стовпця",
+        )
+
+
+
+    @staticmethod
+    def filter_literal(value):
+        """
+        Запис значення у вигляді константи Python для умови фільтрації.
+        Дати записуються рядками ISO ("2020-01-01"), з якими порівнюються стовпці дат.
+        :return: Текст константи або None, якщо значення не можна записати константою
+        """
+        if isinstance(value, pd.Timestamp):
+            value = value.strftime("%Y-%m-%d") if value.tz is None and value == value.normalize() else str(value)
+        elif isinstance(value, np.generic):
+            value = value.item()
+        text = repr(value)
+        try:
+            ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            return None
+        return text
+
+    def index_column(self):
+        """
+        Побудова сортованого індексу вибраного стовпця (у фоні). Діапазонні
+        фільтри за цим стовпцем ("x<=100", "x>5 and x<50") далі виконуються
+        двійковим пошуком, у тому числі після скидання фільтрів.
+        """
+        column = self.column_combo.get() if hasattr(self, "column_combo") else ""
+        if self.processor is None or not column:
+            messagebox.showwarning("Увага", "Будь ласка, виберіть стовпець для індексації!")
+            return
+
+        processor = self.processor
+        version = processor.version
+        original_data = self.original_data
+        shared = processor.indexes is self.base_indexes
+
+        def build(token):
+            index = SortedIndex.from_series(processor.data[column])
+            base_index = None
+            if not shared and column not in self.base_indexes:
+                base_index = SortedIndex.from_series(original_data[column])
+            return index, base_index
+
+        def on_done(result):
+            index, base_index = result
+            # Індекс застарів, якщо дані змінились під час побудови
+            if self.processor is processor and processor.version == version:
+                processor.indexes[column] = index
+            if base_index is not None and self.original_data is original_data:
+                self.base_indexes[column] = base_index
+            self.status_label.config(text=f"Стовпець {column} проіндексовано")
+
+        self.scheduler.submit(
+            "index",
+            build,
+            on_done=on_done,
+            on_error=self.on_task_error("Не вдалося побудувати індекс"),
+            description="індексація",
+        )
+
+    def reset_filters(self):
+        """
+        Скидає всі фільтри та повертає таблицю до початкового стану.
+        """
+        if self.original_data is None:
+            #messagebox.showwarning("Увага", "Оригінальні дані не завантажені або порожні!")
+            return
+        # Незавершені завдання над попередніми даними скасовуються
+        for key in DATA_TASKS:
+            self.scheduler.cancel(key)
+        # Повернення даних до початкового стану
+        self.data = self.original_data.copy()
+        if self.sql_source is not None:
+            self.processor = SqlDataProcessor(self.sql_source, self.data)
+        else:
+            self.processor = DataProcessor(
+                self.data, approximate=self.is_preview, profiles=self.base_profiles, indexes=self.base_indexes
+            )
+        self.active_filters = []
+        self.edit_log = []
+        self.pipeline.record("reset")
+        # Оновлення таблиці
+        self.update_tree(self.data)
+    
+    def apply_filter(self):
+        """
+        Застосовує фільтрацію даних до таблиці self.tree.
+        """
+        if self.data is None or self.data.empty:
+            messagebox.showwarning("Увага", "Дані не завантажено або порожні!")
+            return
+
+        column = self.column_combo.get()
+        condition_str = self.condition_entry.get()
+
+        if not column or not condition_str:
+            messagebox.showwarning("Увага", "Будь ласка, виберіть стовпець та умову для фільтрації!")
+            return
+
+        try:
+            # Створення умови фільтрації
+            condition = FilterCondition(condition_str)
+        except Exception as e:
+            messagebox.showerror("Помилка", f"Не вдалося застосувати фільтрацію: {e}")
+            return
+
+        def on_done(filtered):
+            # Поки фільтр виконувався, дані могли бути замінені
+            if self.processor is not processor:
+                return
+            # Оновлення даних і таблиці
+            self.update_tree(filtered.data)
+            self.data = filtered.data  # Оновлюємо внутрішні дані
+            self.processor = filtered  # Обробник відфільтрованих даних з перенесеними індексами
+            self.active_filters.append((column, condition_str))
+            self.pipeline.record("filter", column=column, condition=condition_str)
+            messagebox.showinfo("Успіх", "Фільтрацію застосовано!")
+
+        # Новий фільтр скасовує попередній незавершений
+        processor = self.processor
+        self.scheduler.submit(
+            "filter",
+            lambda token: processor.filtered([(column, condition)], token),
+            on_done=on_done,
+            on_error=self.on_task_error("Не вдалося застосувати фільтрацію"),
+            description="фільтрація",
+        )
+
+    def clean_data(self):
+        """
+        Виклик очищення даних через DataProcessor (у фоновому потоці).
+        Очищення виконується в пам'яті, тож дані з SQLite спочатку читаються повністю.
+        """
+        if not self.processor:
+            return
+
+        source = self.processor
+        load_all = isinstance(source, SqlDataProcessor) and not source.exhausted
+        if load_all and not messagebox.askyesno(
+            "Очищення",
+            "Очищення виконується в пам'яті: з бази буде прочитано всі рядки, а подальші "
+            "фільтри і статистика обчислюватимуться без бази. Продовжити?",
+        ):
+            return
+
+        version = source.version
+        preview = self.is_preview
+
+        def run(token, data, indexes):
+            # Копія робиться у фоновому потоці; якщо дані тим часом редагувались,
+            # результат відкидається в on_done
+            data = source.source.fetch()[0] if load_all else data.copy()
+            processor = DataProcessor(data, approximate=preview, indexes=indexes)
+            processor.clean_data()
+            return processor
+
+        def on_done(processor):
+            # Поки дані очищувались, їх могли замінити або відфільтрувати
+            if self.processor is not source:
+                return
+            # (дочитані з бази сторінки не важливі: при load_all рядки прочитано заново)
+            if not load_all and source.version != version:
+                messagebox.showwarning("Увага", "Дані змінились під час очищення. Повторіть очищення.")
+                return
+            self.processor = processor
+            self.data = processor.data
+            self.update_tree(self.data)
+            self.pipeline.record("clean")
+            if load_all:
+                self.status_label.config(text=f"SQLite: усі рядки прочитано в пам'ять ({len(self.data)})")
+            messagebox.showinfo("Успіх", "Дані очищено!")
+
+        self.scheduler.submit(
+            "clean",
+            run,
+            self.data,
+            dict(self.processor.indexes),
+            on_done=on_done,
+            on_error=self.on_task_error("Не вдалося очистити дані"),
+            description="очищення",
+        )
+
+
+    def update_tree(self, new_data):
+        """
+        Оновлює таблицю self.tree з новими даними.
+        Створюються лише стовпці, що вміщуються у видиму ширину таблиці.
+        :param new_data: DataFrame із даними для відображення.
+        """
+        if self.table_data is None or list(self.table_data.columns) != list(new_data.columns):
+            self.col_offset = 0
+        self.table_data = new_data
+
+        # Очистка таблиці
+        self.tree.delete(*self.tree.get_children())
+        self.render_generation += 1
+        self.configure_visible_columns()
+
+        # Додавання нових даних
+        window = self.table_data.iloc[:, self.col_offset:self.col_offset + self.visible_count]
+        for position, row in enumerate(window.itertuples(index=False, name=None)):
+            self.tree.insert("", "end", iid=str(position), values=row)
+        self.rendered_generation = np.full(len(new_data), self.render_generation, dtype=np.int64)
+
+    def append_tree_rows(self, count):
+        """
+        Додає до таблиці останні count рядків self.table_data.
+        """
+        start = len(self.rendered_generation)
+        window = self.table_data.iloc[start:start + count, self.col_offset:self.col_offset + self.visible_count]
+        item = None
+        for position, row in enumerate(window.itertuples(index=False, name=None), start):
+            item = self.tree.insert("", "end", iid=str(position), values=row)
+        self.rendered_generation = np.concatenate(
+            [self.rendered_generation, np.full(count, self.render_generation, dtype=np.int64)]
         )
-        self.column_combo.grid(row=2, column=1, padx=10, pady=5, sticky="w")
+        return item
 
-        self.condition_entry = tk.Entry(self.processing_frame)
-        self.condition_entry.grid(row=2, column=2, padx=10, pady=5, sticky="w")
+    def configure_visible_columns(self):
+        """
+        Налаштування вікна видимих стовпців таблиці та горизонтального скролбара.
+        """
+        columns = list(self.table_data.columns)
+        width = self.tree.winfo_width()
+        count = width // COLUMN_WIDTH + 1 if width > 1 else 10
+        self.visible_count = max(1, min(count, len(columns)))
+        self.col_offset = max(0, min(self.col_offset, len(columns) - self.visible_count))
 
+        visible = columns[self.col_offset:self.col_offset + self.visible_count]
+        self.tree["columns"] = visible
+        for col in visible:
+            text = f"✔ {col}" if col in self.selected_columns else col
+            self.tree.heading(col, text=text, anchor="center")
+            self.tree.column(col, width=COLUMN_WIDTH, anchor="center", stretch=False)
 
+        if columns:
+            self.scrollbar_x.set(self.col_offset / len(columns), (self.col_offset + self.visible_count) / len(columns))
+        else:
+            self.scrollbar_x.set(0, 1)
 
-    def reset_filters(self):
+    def on_xscroll(self, *args):
         """
-        Скидає всі фільтри та повертає таблицю до початкового стану.
+        Обробник горизонтального скролбара: зсуває вікно стовпців.
         """
-        if self.original_data is None:
-            #messagebox.showwarning("Увага", "Оригінальні дані не завантажені або порожні!")
+        if self.table_data is None:
             return
-        # Повернення даних до початкового стану
-        self.data = self.original_data.copy()
-        self.processor = DataProcessor(self.data)
-        # Оновлення таблиці
-        self.update_tree(self.data)
-    
-    def apply_filter(self):
+        total = len(self.table_data.columns)
+        if args[0] == "moveto":
+            offset = int(round(float(args[1]) * total))
+        elif args[2] == "pages":
+            offset = self.col_offset + int(args[1]) * self.visible_count
+        else:
+            offset = self.col_offset + int(args[1])
+        offset = max(0, min(offset, total - self.visible_count))
+        if offset != self.col_offset:
+            self.col_offset = offset
+            self.rerender_columns()
+
+    def on_tree_resize(self, event):
         """
-        Застосовує фільтрацію даних до таблиці self.tree.
+        Зміна ширини таблиці змінює кількість видимих стовпців.
         """
-        if self.data is None or self.data.empty:
-            messagebox.showwarning("Увага", "Дані не завантажено або порожні!")
+        if self.table_data is None:
             return
+        count = max(1, min(event.width // COLUMN_WIDTH + 1, len(self.table_data.columns)))
+        if count != self.visible_count:
+            self.rerender_columns()
 
-        column = self.column_combo.get()
-        condition_str = self.condition_entry.get()
+    def rerender_columns(self):
+        """
+        Перемальовування після зсуву вікна стовпців: видимі рядки
+        оновлюються одразу, решта - частинами у фоні.
+        """
+        self.render_generation += 1
+        self.configure_visible_columns()
+        self.refresh_visible_rows()
+        if self.refresh_job is None:
+            self.refresh_job = self.root.after(1, self.refresh_stale_rows)
 
-        if not column or not condition_str:
-            messagebox.showwarning("Увага", "Будь ласка, виберіть стовпець та умову для фільтрації!")
+    def refresh_rows(self, positions):
+        """
+        Оновлення значень рядків таблиці для поточного вікна стовпців.
+        :param positions: Масив номерів рядків
+        """
+        if len(positions) == 0:
             return
+        window = self.table_data.iloc[positions, self.col_offset:self.col_offset + self.visible_count]
+        for position, row in zip(positions, window.itertuples(index=False, name=None)):
+            self.tree.item(str(position), values=row)
+        self.rendered_generation[positions] = self.render_generation
 
-        try:
-            # Створення умови фільтрації
-            condition = eval(f"lambda x: {condition_str}")
-
-            # Застосування фільтрації
-            filtered_data = self.processor.filter_data(column, condition)
-
-            # Оновлення даних і таблиці
-            self.update_tree(filtered_data)
-            self.data = filtered_data  # Оновлюємо внутрішні дані
-            self.processor = DataProcessor(self.data)  # Оновлюємо обробник даних
+    def refresh_visible_rows(self):
+        total = len(self.rendered_generation)
+        if total == 0:
+            return
+        first, last = self.tree.yview()
+        start, end = int(first * total), min(total, int(np.ceil(last * total)) + 1)
+        stale = np.flatnonzero(self.rendered_generation[start:end] != self.render_generation) + start
+        self.refresh_rows(stale)
 
-            messagebox.showinfo("Успіх", "Фільтрацію застосовано!")
-        except Exception as e:
-            messagebox.showerror("Помилка", f"Не вдалося застосувати фільтрацію: {e}")
-   
-    def clean_data(self):
+    def refresh_stale_rows(self):
         """
-        Виклик очищення даних через DataProcessor.
+        Фонове оновлення рядків, що ще показують попереднє вікно стовпців.
         """
-        if self.processor:
-            self.processor.clean_data()
-            self.data = self.processor.data
-            messagebox.showinfo("Успіх", "Дані очищено!")
-            for row in self.tree.get_children():
-                self.tree.delete(row)
-            
-            for _, row in self.data.iterrows():
-                self.tree.insert("", "end", values=row.tolist())
-
-        # Вставка очищених даних у Treeview
-        for _, row in self.data.iterrows():
-            self.tree.insert("", "end", values=row.tolist())
+        self.refresh_job = None
+        stale = np.flatnonzero(self.rendered_generation != self.render_generation)
+        self.refresh_rows(stale[:REFRESH_BATCH_ROWS])
+        if len(stale) > REFRESH_BATCH_ROWS:
+            self.refresh_job = self.root.after(1, self.refresh_stale_rows)
 
+    def on_tree_yscroll(self, first, last):
+        """
+        Вертикальна прокрутка: застарілі рядки у видимій області оновлюються одразу.
+        """
+        self.scrollbar_y.set(first, last)
+        if self.refresh_job is not None:
+            self.refresh_visible_rows()
+        # Дані з SQLite дочитуються сторінками при прокручуванні донизу
+        if float(last) >= 0.999 and isinstance(self.processor, SqlDataProcessor) and not self.processor.exhausted:
+            self.fetch_next_page()
 
-    def update_tree(self, new_data):
+    def fetch_next_page(self):
         """
-        Оновлює таблицю self.tree з новими даними.
-        :param new_data: DataFrame із даними для відображення.
+        Читання наступної сторінки рядків з SQLite у фоні.
         """
-        # Очистка таблиці
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+        if "page" in self.scheduler.tasks:
+            return
+        processor = self.processor
 
-        # Оновлення колонок
-        self.tree["columns"] = list(new_data.columns)
-        for col in new_data.columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, anchor="center")
+        def on_done(page):
+            # Поки сторінка читалась, дані могли бути замінені
+            if self.processor is not processor:
+                return
+            rows, fetched = page
+            processor.add_page(rows, fetched)
+            self.data = processor.data
+            self.table_data = self.data
+            if not rows.empty:
+                self.append_tree_rows(len(rows))
+            self.status_label.config(text=f"SQLite: прочитано {len(self.data)} рядків")
 
-        # Додавання нових даних
-        for index, row in new_data.iterrows():
-            self.tree.insert("", "end", values=row.tolist())
+        self.scheduler.submit(
+            "page",
+            lambda token: processor.next_page(),
+            on_done=on_done,
+            on_error=self.on_task_error("Не вдалося прочитати дані з бази"),
+            description="читання сторінки",
+        )
 
     def on_column_select(self, event):
         # Отримуємо обраний стовпець 
@@ -353,6 +3304,10 @@ class DataLoaderApp:
             else:
                 self.selected_columns.add(col_name)
                 self.tree.heading(col_name, text=f"✔ {col_name}", anchor="center")  # Додаємо індикатор вибору
+            # Порядок стовпців береться з даних: у таблиці показано лише видиме вікно стовпців
+            self.pipeline.record(
+                "select_columns", columns=[col for col in self.table_data.columns if col in self.selected_columns]
+            )
 
     def load_data(self):
         """
@@ -364,25 +3319,332 @@ class DataLoaderApp:
         if not file_path:
             return
 
+        def on_done(result):
+            self.data, self.source_size = result
+            self.source_path = file_path
+            self.on_data_loaded(preview=False)
+
+        self.scheduler.submit(
+            "load",
+            lambda token: read_table_snapshot(file_path),
+            on_done=on_done,
+            on_error=self.on_task_error("Не вдалося завантажити файл"),
+            description="завантаження",
+        )
+
+    def open_sqlite(self):
+        """
+        Відкриття таблиці або запиту з бази SQLite без експорту у CSV.
+        """
+        path = filedialog.askopenfilename(
+            filetypes=[("SQLite", "*.db;*.sqlite;*.sqlite3"), ("All files", "*.*")]
+        )
+        if not path:
+            return
         try:
-            if file_path.endswith(".csv"):
-                self.data = pd.read_csv(file_path)
-            elif file_path.endswith(".xlsx"):
-                self.data = pd.read_excel(file_path)
-            else:
-                messagebox.showerror("Помилка", "Непідтримуваний формат файлу!")
+            tables = SqliteSource.list_tables(path)
+        except sqlite3.Error as e:
+            messagebox.showerror("Помилка", f"Не вдалося відкрити базу: {e}")
+            return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Джерело SQLite")
+        tk.Label(dialog, text="Таблиця:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        table_combo = ttk.Combobox(dialog, values=tables, state="readonly")
+        if tables:
+            table_combo.current(0)
+        table_combo.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+        tk.Label(dialog, text="Або запит SQL:").grid(row=1, column=0, padx=5, pady=5, sticky="nw")
+        query_text = tk.Text(dialog, width=60, height=6)
+        query_text.grid(row=1, column=1, padx=5, pady=5, sticky="nsew")
+
+        def on_open():
+            query = query_text.get("1.0", "end").strip()
+            table = table_combo.get()
+            if not query and not table:
+                messagebox.showwarning("Увага", "Виберіть таблицю або введіть запит!", parent=dialog)
                 return
-            # Зберігаємо оригінальні дані
-            self.original_data = self.data.copy()
+            dialog.destroy()
+            self.load_sqlite(SqliteSource(path, table=None if query else table, query=query or None))
 
-            self.processor = DataProcessor(self.data)
-            self.update_table()
-            self.report_button.config(state="normal")
-            self.setup_processing_widgets_data_loadet()
+        tk.Button(dialog, text="Відкрити", command=on_open).grid(row=2, column=1, padx=5, pady=5, sticky="e")
+        dialog.grid_columnconfigure(1, weight=1)
 
-        except Exception as e:
-            messagebox.showerror("Помилка", f"Не вдалося завантажити файл: {e}")
+    def load_sqlite(self, source):
+        """
+        Читання першої сторінки рядків з SQLite. Наступні сторінки читаються
+        при прокручуванні таблиці, фільтри і статистика виконуються базою.
+        :param source: SqliteSource
+        """
+        def load(token):
+            processor = SqlDataProcessor(source)
+            processor.count_rows()
+            return processor
+
+        def on_done(processor):
+            self.data = processor.data
+            self.source_path = source.path
+            self.source_size = os.path.getsize(source.path)
+            self.on_data_loaded(preview=False)
+            self.sql_source = source
+            self.processor = processor
+            self.status_label.config(
+                text=f"SQLite: прочитано {len(self.data)} з {processor.count_rows()} рядків "
+                     f"(решта читається при прокручуванні)"
+            )
+
+        self.scheduler.submit(
+            "load",
+            load,
+            on_done=on_done,
+            on_error=self.on_task_error("Не вдалося прочитати дані з бази"),
+            description="читання SQLite",
+        )
+
+    def preview_data(self, mode="head"):
+        """
+        Швидкий перегляд великого файлу: читається лише вибірка рядків.
+        Статистика за вибіркою позначається як наближена.
+        :param mode: "head" - перші рядки, "reservoir" - рівномірна вибірка
+        """
+        file_path = filedialog.askopenfilename(
+            filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+
+        def on_done(sample):
+            self.data = sample
+            self.source_path = file_path
+            self.on_data_loaded(preview=True)
+
+        self.scheduler.submit(
+            "load",
+            lambda token: read_sample(file_path, PREVIEW_ROWS, mode),
+            on_done=on_done,
+            on_error=self.on_task_error("Не вдалося завантажити файл"),
+            description="попередній перегляд",
+        )
+
+    def load_full_data(self):
+        """
+        Повне завантаження файлу, відкритого у режимі попереднього перегляду.
+        Вибрані стовпці зберігаються, записані фільтри, очищення та
+        редагування повторно застосовуються до повних даних.
+        """
+        if not self.is_preview or not self.source_path:
+            return
+
+        file_path = self.source_path
+        pipeline = self.pipeline
+        edit_log = list(self.edit_log)
+
+        def load(token):
+            original_data, size = read_table_snapshot(file_path)
+            result = pipeline.apply(original_data, cancel_token=token)
+            if edit_log:
+                data = result.data.copy() if result.data is original_data else result.data
+                result.data = apply_edit_log(data, edit_log)
+            return result, size
+
+        def on_done(outcome):
+            result, self.source_size = outcome
+            self.data = result.data
+            self.selected_columns = {col for col in self.selected_columns if col in self.data.columns}
+            changed = result.data is not result.original_data
+            self.on_data_loaded(preview=False, original_data=result.original_data if changed else None)
+            self.active_filters = list(result.active_filters)
+            self.edit_log = edit_log
+            self.pipeline = pipeline
+            if changed:
+                self.status_label.config(
+                    text=f"Завантажено рядків: {len(self.original_data)}, після фільтрів, очищення "
+                         f"та редагувань: {len(self.data)}"
+                )
+
+        self.scheduler.submit(
+            "load",
+            load,
+            on_done=on_done,
+            on_error=self.on_task_error("Не вдалося завантажити файл"),
+            description="повне завантаження",
+        )
+
+    def on_data_loaded(self, preview, original_data=None):
+        """
+        Оновлення стану програми після завантаження нових даних.
+        :param preview: Дані є вибіркою (режим попереднього перегляду)
+        :param original_data: Оригінальні дані, якщо self.data вже відрізняється від них
+        """
+        self.stop_follow()
+        for key in DATA_TASKS:
+            self.scheduler.cancel(key)
+        self.is_preview = preview
+        self.sql_source = None
+        self.active_filters = []
+        self.edit_log = []
+        self.chart_files = []
+        self.pipeline = Pipeline()
+        # Зберігаємо оригінальні дані
+        self.original_data = self.data.copy() if original_data is None else original_data
+
+        # Профілі та індекси оригінальних даних повторно використовуються після скидання фільтрів
+        self.base_profiles = {}
+        self.base_indexes = {}
+        self.processor = DataProcessor(
+            self.data,
+            approximate=preview,
+            profiles=self.base_profiles if original_data is None else None,
+            indexes=self.base_indexes if original_data is None else None,
+        )
+        self.update_table()
+        self.report_button.config(state="normal")
+        self.setup_processing_widgets_data_loadet()
+
+        self.filemenu.entryconfig("Завантажити повністю", state="normal" if preview else "disabled")
+        if preview:
+            self.status_label.config(
+                text=f"Попередній перегляд: {len(self.data)} рядків (статистика наближена). "
+                     f"Файл > Завантажити повністю - для повних даних."
+            )
+        else:
+            self.status_label.config(text=f"Завантажено рядків: {len(self.data)}")
     
+    def toggle_follow(self):
+        """
+        Вмикає або вимикає режим стеження за файлом.
+        """
+        if self.follow_var.get():
+            self.start_follow()
+        else:
+            self.stop_follow()
+
+    def start_follow(self):
+        """
+        Запуск стеження за CSV файлом: дописані рядки періодично
+        додаються до даних, таблиці та статистики.
+        """
+        if self.data is None or not self.source_path or not self.source_path.endswith(".csv"):
+            messagebox.showwarning("Увага", "Стеження доступне лише для завантаженого CSV файлу!")
+            self.follow_var.set(False)
+            return
+        if self.is_preview or list(pd.read_csv(self.source_path, nrows=0).columns) != list(self.original_data.columns):
+            messagebox.showwarning("Увага", "Спочатку завантажте файл повністю!")
+            self.follow_var.set(False)
+            return
+
+        self.follower = CsvFollower(
+            self.source_path, self.original_data.columns, self.original_data.dtypes, self.source_size
+        )
+        self.follow_var.set(True)
+        self.follow_job = self.root.after(FOLLOW_INTERVAL_MS, self.poll_followed_file)
+
+    def stop_follow(self):
+        """
+        Зупинка стеження за файлом.
+        """
+        if self.follow_job is not None:
+            self.root.after_cancel(self.follow_job)
+        self.follow_job = None
+        self.follower = None
+        self.scheduler.cancel("follow")
+        self.follow_var.set(False)
+
+    def poll_followed_file(self):
+        """
+        Один крок стеження. Читання і розбір дописаних байтів, фільтрація
+        нових рядків та об'єднання з даними виконуються у фоні; усі записи,
+        що надійшли між опитуваннями, додаються одним блоком.
+        """
+        self.follow_job = None
+        follower = self.follower
+        original_data = self.original_data
+        processor = self.processor
+        version = processor.version
+        active_filters = list(self.active_filters)
+
+        def read(token):
+            pieces = []
+            pending = True
+            while pending:
+                token.check()
+                rows, pending = follower.read_new_rows()
+                if rows is not None and not rows.empty:
+                    pieces.append(rows)
+            if not pieces:
+                return None
+            rows = pd.concat(pieces)
+            start = original_data.index.max() + 1 if len(original_data) else 0
+            rows.index = pd.RangeIndex(start, start + len(rows))
+            visible = DataProcessor(rows).filter_many(active_filters) if active_filters else rows
+            return (
+                rows,
+                pd.concat([original_data, rows]),
+                visible,
+                pd.concat([processor.data, visible]) if not visible.empty else None,
+                version,
+            )
+
+        def on_done(result):
+            if self.follower is not follower:
+                return
+            if result is not None:
+                self.append_rows(original_data, processor, *result)
+                self.source_size = follower.offset - len(follower.remainder)
+            self.follow_job = self.root.after(FOLLOW_INTERVAL_MS, self.poll_followed_file)
+
+        def on_error(error):
+            if self.follower is follower:
+                self.stop_follow()
+                messagebox.showerror("Помилка", f"Стеження за файлом зупинено: {error}")
+
+        self.scheduler.submit(
+            "follow", read, on_done=on_done, on_error=on_error, description="стеження", cancellable=False
+        )
+
+    def append_rows(self, original_data, processor, rows, combined, visible, combined_visible, version):
+        """
+        Інкрементальне додавання рядків: до оригінальних даних, до поточних
+        даних (з урахуванням активних фільтрів), до таблиці та статистики.
+        Об'єднання, підготовлені у фоні, використовуються, лише якщо дані
+        не змінились під час читання; інакше рядки об'єднуються тут.
+        :param original_data: Оригінальні дані, з якими об'єднано combined
+        :param processor: Обробник, з даними якого об'єднано combined_visible
+        :param rows: DataFrame з новими рядками
+        :param combined: Оригінальні дані разом з новими рядками
+        :param visible: Нові рядки, що проходять активні фільтри
+        :param combined_visible: Поточні дані разом з visible (None, якщо visible порожній)
+        :param version: Версія даних processor на момент об'єднання
+        """
+        if self.original_data is not original_data:
+            combined = pd.concat([self.original_data, rows])
+        self.original_data = combined
+        # Якщо профілі спільні з поточними даними, вони оновлюються нижче
+        if self.processor.profiles is not self.base_profiles:
+            self.base_profiles.clear()
+        if self.processor.indexes is not self.base_indexes:
+            positions = np.arange(len(self.original_data) - len(rows), len(self.original_data))
+            for column, index in list(self.base_indexes.items()):
+                if SortedIndex.supports(self.original_data[column]):
+                    self.base_indexes[column] = index.insert(self.original_data[column], positions)
+                else:
+                    del self.base_indexes[column]
+
+        if self.processor is not processor or processor.version != version:
+            # Фільтри або дані змінились під час читання
+            visible = DataProcessor(rows).filter_many(self.active_filters) if self.active_filters else rows
+            combined_visible = None
+        if not visible.empty:
+            at_bottom = self.tree.yview()[1] >= 0.999
+            self.processor.append(visible, combined_visible)
+            self.data = self.processor.data
+            self.table_data = self.data
+            last_item = self.append_tree_rows(len(visible))
+            if at_bottom:
+                self.tree.see(last_item)
+
+        self.status_label.config(text=f"Стеження: {len(self.data)} рядків (+{len(visible)})")
+
     def filter_data(self, column, condition_str):
         """
         Виклик фільтрації даних через DataProcessor.
@@ -394,13 +3656,154 @@ class DataLoaderApp:
             return
 
         try:
-            condition = eval(f"lambda x: {condition_str}")
-            filtered_data = self.processor.filter_data(column, condition)
-            self.data = filtered_data
-            self.processor = DataProcessor(self.data)
+            self.processor = self.processor.filtered([(column, FilterCondition(condition_str))])
+            self.data = self.processor.data
+            self.active_filters.append((column, condition_str))
+            self.pipeline.record("filter", column=column, condition=condition_str)
         except Exception as e:
             messagebox.showerror("Помилка", f"Не вдалося застосувати фільтрацію: {e}")
 
+    def save_session(self):
+        """
+        Збереження робочого стану (оригінальні та відфільтровані дані,
+        вибрані стовпці, фільтри, журнал редагувань) у двійковий знімок.
+        """
+        if self.data is None:
+            messagebox.showwarning("Увага", "Дані відсутні для збереження!")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".pdsession", filetypes=[("Сесія", "*.pdsession")])
+        if not path:
+            return
+
+        state = SessionState()
+        state.original_data = self.original_data
+        state.data = self.data
+        state.source_path = self.source_path
+        state.is_preview = self.is_preview
+        state.selected_columns = [col for col in self.data.columns if col in self.selected_columns]
+        state.active_filters = list(self.active_filters)
+        state.edit_log = list(self.edit_log)
+        state.pipeline_steps = list(self.pipeline.steps)
+
+        self.scheduler.submit(
+            "session",
+            lambda token: save_session(path, state),
+            on_done=lambda result: self.status_label.config(text=f"Сесію збережено: {path}"),
+            on_error=self.on_task_error("Не вдалося зберегти сесію"),
+            description="збереження сесії",
+        )
+
+    def open_session(self):
+        """
+        Відкриття збереженого знімка сесії.
+        """
+        path = filedialog.askdirectory(title="Оберіть теку сесії (.pdsession)")
+        if not path:
+            return
+
+        def on_done(state):
+            self.data = state.data
+            self.source_path = state.source_path
+            self.source_size = os.path.getsize(state.source_path) if state.source_path and os.path.exists(state.source_path) else 0
+            self.selected_columns = set(state.selected_columns)
+            self.on_data_loaded(state.is_preview, original_data=state.original_data)
+            self.active_filters = list(state.active_filters)
+            self.edit_log = list(state.edit_log)
+            self.pipeline = Pipeline(state.pipeline_steps)
+            self.status_label.config(text=f"Сесію відкрито: {len(self.data)} з {len(self.original_data)} рядків")
+
+        self.scheduler.submit(
+            "load",
+            lambda token: load_session(path),
+            on_done=on_done,
+            on_error=self.on_task_error("Не вдалося відкрити сесію"),
+            description="відкриття сесії",
+        )
+
+    def save_pipeline(self):
+        """
+        Збереження записаних операцій сесії у файл конвеєра.
+        """
+        if not self.pipeline.steps:
+            messagebox.showwarning("Увага", "Немає записаних операцій!")
+            return
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("Конвеєр", "*.json")])
+        if not file_path:
+            return
+        try:
+            self.pipeline.save(file_path)
+            messagebox.showinfo("Успіх", f"Конвеєр збережено у файл: {file_path}")
+        except Exception as e:
+            messagebox.showerror("Помилка", f"Не вдалося зберегти конвеєр: {e}")
+
+    def replay_pipeline(self):
+        """
+        Відтворення збереженого конвеєра на новому файлі даних.
+        """
+        pipeline_path = filedialog.askopenfilename(title="Оберіть конвеєр", filetypes=[("Конвеєр", "*.json")])
+        if not pipeline_path:
+            return
+        file_path = filedialog.askopenfilename(
+            title="Оберіть файл даних",
+            filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx"), ("All files", "*.*")],
+        )
+        if not file_path:
+            return
+
+        try:
+            pipeline = Pipeline.load(pipeline_path)
+        except Exception as e:
+            messagebox.showerror("Помилка", f"Не вдалося відкрити конвеєр: {e}")
+            return
+
+        # Умови фільтрів виконуються як код Python - чужий конвеєр може містити будь-що
+        unsafe = pipeline.unsafe_conditions()
+        if unsafe and not messagebox.askyesno(
+            "Увага",
+            "Конвеєр містить умови, які виконуються як код Python:\n\n"
+            + "\n".join(unsafe[:10])
+            + "\n\nВідтворюйте лише конвеєри з надійних джерел. Продовжити?",
+        ):
+            return
+
+        output_dir = None
+        if pipeline.has_outputs():
+            output_dir = filedialog.askdirectory(title="Тека для графіків і звітів")
+            if not output_dir:
+                return
+
+        def run(token):
+            started = time.perf_counter()
+            size = os.path.getsize(file_path)
+            result = pipeline.run(file_path, output_dir, token)
+            return result, size, time.perf_counter() - started
+
+        def on_done(outcome):
+            result, self.source_size, elapsed = outcome
+            self.data = result.original_data
+            self.source_path = file_path
+            self.on_data_loaded(preview=False)
+
+            self.data = result.data
+            self.processor = DataProcessor(self.data)
+            self.active_filters = list(result.active_filters)
+            self.pipeline = pipeline
+            self.selected_columns = set(result.selected_columns)
+            self.chart_files = list(result.chart_files)
+            self.update_tree(self.data)
+            self.status_label.config(
+                text=f"Конвеєр відтворено за {elapsed:.1f} с: {len(self.data)} рядків, "
+                     f"графіків: {len(result.chart_files)}, звітів: {len(result.report_files)}"
+            )
+
+        self.scheduler.submit(
+            "load",
+            run,
+            on_done=on_done,
+            on_error=self.on_task_error("Не вдалося відтворити конвеєр"),
+            description="відтворення конвеєра",
+        )
+
     def create_report(self):
         if not self.selected_columns:
             self.selected_columns = self.data.columns
@@ -410,12 +3813,47 @@ class DataLoaderApp:
             return
 
         include_graphics = messagebox.askyesno("Графіки", "Включити графіки у звіт?")
+        # Діалоги Tk можна відкривати лише у головному потоці
+        image_files = []
+        # FPDF не вставляє SVG, тому пропонуються лише растрові файли
+        charts = [path for path in self.chart_files if path.endswith(".png") and os.path.exists(path)]
+        if include_graphics and charts and messagebox.askyesno(
+            "Графіки", f"Додати побудовані графіки ({len(charts)})?"
+        ):
+            image_files = charts
+        elif include_graphics:
+            image_files = filedialog.askopenfilenames(
+                title="Оберіть файли графіків",
+                filetypes=[("Зображення", "*.png;*.jpg;*.jpeg;*.bmp")],
+            )
 
-        try:
-            self.processor.generate_report(file_path, list(self.selected_columns), include_graphics)
-            messagebox.showinfo("Успіх", "Звіт успішно створено та збережено!")
-        except Exception as e:
-            messagebox.showerror("Помилка", f"Не вдалося створити звіт: {e}")
+        include_appendix = messagebox.askyesno("Додаток", "Додати до звіту рядки вибраних стовпців?")
+
+        processor = self.processor
+        if (
+            include_appendix
+            and importlib.util.find_spec("pypdf") is None
+            and processor.count_rows() > APPENDIX_PART_ROWS
+            and not messagebox.askyesno(
+                "Додаток",
+                "Модуль pypdf не встановлено: великий додаток буде записано одним документом, "
+                "що повільно і потребує багато пам'яті (pip install pypdf). Продовжити?",
+            )
+        ):
+            return
+        columns = list(self.selected_columns)
+        self.pipeline.record(
+            "report", columns=columns, include_graphics=include_graphics, include_appendix=include_appendix
+        )
+        self.scheduler.submit(
+            "report",
+            lambda token: processor.generate_report(
+                file_path, columns, include_graphics, image_files, include_appendix, token
+            ),
+            on_done=lambda result: messagebox.showinfo("Успіх", "Звіт успішно створено та збережено!"),
+            on_error=self.on_task_error("Не вдалося створити звіт"),
+            description="звіт",
+        )
 
     def load_file(self):
         # Відкриття діалогового вікна для вибору файлу
@@ -473,16 +3911,7 @@ class DataLoaderApp:
             messagebox.showerror("Помилка", f"Не вдалося зберегти файл: {e}")
 
     def update_table(self):
-        self.tree.delete(*self.tree.get_children())
-
-        columns = list(self.data.columns)
-        self.tree["columns"] = columns
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=100, anchor="center")
-
-        for _, row in self.data.iterrows():
-            self.tree.insert("", "end", values=list(row))
+        self.update_tree(self.data)
 
         #messagebox.showinfo("Успіх", "Файл успішно завантажено!")
 
@@ -534,35 +3963,57 @@ class DataLoaderApp:
         if not self.selected_item:
             return
 
-        # Отримуємо дані про вибраний рядок
-        values = self.tree.item(self.selected_item, "values")
-        if not values:
+        # Отримуємо дані про вибраний рядок (усі стовпці, не лише видимі)
+        position = int(self.selected_item[0])
+        if self.table_data is None or position >= len(self.table_data):
             messagebox.showwarning("Увага", "Рядок порожній або не знайдено даних.")
             return
-
-        # Очищення попереднього вмісту
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+        row = self.table_data.iloc[position]
 
         # Налаштування колонок для розтягування
         self.scrollable_frame.grid_columnconfigure(0, weight=0)  # Для міток
         self.scrollable_frame.grid_columnconfigure(1, weight=1)  # Для полів вводу
 
-        # Створення полів вводу для редагування
-        self.edit_entries = []
-        for i, (col_name, value) in enumerate(zip(self.tree["columns"], values)):
-            ttk.Label(self.scrollable_frame, text=f"{col_name}:", style="TLabel").grid(row=i, column=0, sticky="w", pady=5, padx=5)
+        # Поля вводу беруться з пулу, нові створюються лише за потреби
+        while len(self.editor_rows) < len(row):
+            i = len(self.editor_rows)
+            label = ttk.Label(self.scrollable_frame, style="TLabel")
+            label.grid(row=i, column=0, sticky="w", pady=5, padx=5)
             entry = ttk.Entry(self.scrollable_frame, style="TEntry")
-            entry.insert(0, value)
             entry.grid(row=i, column=1, pady=5, padx=5, sticky="ew")
-            self.edit_entries.append(entry)
+            self.editor_rows.append((label, entry))
+
+        for i, (label, entry) in enumerate(self.editor_rows):
+            if i < len(row):
+                label.config(text=f"{row.index[i]}:")
+                entry.delete(0, "end")
+                entry.insert(0, str(row.iloc[i]))
+                if not label.winfo_ismapped():
+                    label.grid()
+                    entry.grid()
+            else:
+                label.grid_remove()
+                entry.grid_remove()
 
     def save_edited_item(self, item_id):
         """
-        Збереження відредагованого елемента.
+        Збереження відредагованого елемента у дані та таблицю.
         """
-        new_values = [entry.get() for entry in self.edit_entries]
-        self.tree.item(item_id, values=new_values)
+        if not item_id:
+            return
+        position = int(item_id[0])
+        row = self.table_data.iloc[position]
+        try:
+            for i, column in enumerate(row.index):
+                new_value = self.editor_rows[i][1].get()
+                if new_value != str(row.iloc[i]):
+                    self.processor.update_cell(position, column, new_value)
+                    self.edit_log.append({"row": row.name, "column": column, "value": new_value})
+        except ValueError as e:
+            messagebox.showerror("Помилка", str(e))
+            return
+        finally:
+            self.refresh_rows(np.array([position]))
         messagebox.showinfo("Успіх", "Дані успішно оновлено!")
 
     def plot_selected_columns(self):
@@ -601,7 +4052,7 @@ class DataLoaderApp:
         # Обмеження кількості даних
         tk.Label(plot_window, text="Кількість елементів для побудови (максимум):").grid(row=3, column=0, pady=5, padx=5, sticky="w")
         limit_entry = tk.Entry(plot_window)
-        limit_entry.insert(0, str(len(self.data)))  # За замовчуванням — всі дані
+        limit_entry.insert(0, str(self.processor.count_rows()))  # За замовчуванням — всі дані
         limit_entry.grid(row=3, column=1, pady=5, padx=5, sticky="ew")
 
         # Поле для попереднього перегляду
@@ -639,72 +4090,151 @@ class DataLoaderApp:
         plot_window.grid_rowconfigure(4, weight=1)  # Рядок з Canvas
         plot_window.grid_columnconfigure(1, weight=1)
 
+    def batch_charts(self):
+        """
+        Пакетна побудова графіків у файли PNG/SVG: усі поєднання вибраних
+        стовпців X, Y і типів графіків малюються паралельно без вікон.
+        Побудовані графіки автоматично пропонуються при створенні звіту.
+        """
+        if self.data is None or self.data.empty:
+            messagebox.showwarning("Увага", "Спочатку завантажте дані!")
+            return
+
+        column_names = list(self.data.columns)
+        numeric = [
+            i for i, col in enumerate(column_names)
+            if pd.api.types.is_numeric_dtype(self.data[col]) and not pd.api.types.is_bool_dtype(self.data[col])
+        ]
+        plot_types = ["Автоматичний", "Лінійний", "Стовпчастий", "Точковий", "Гістограма", "Кругова діаграма"]
+
+        batch_window = tk.Toplevel(self.root)
+        batch_window.title("Пакет графіків")
+
+        def make_list(row, column, label, values):
+            tk.Label(batch_window, text=label).grid(row=row, column=column, padx=5, pady=5, sticky="w")
+            listbox = tk.Listbox(batch_window, selectmode="extended", exportselection=False, height=10)
+            for value in values:
+                listbox.insert("end", value)
+            listbox.grid(row=row + 1, column=column, padx=5, pady=5, sticky="nsew")
+            return listbox
+
+        x_list = make_list(0, 0, "Стовпці X:", column_names)
+        y_list = make_list(0, 1, "Стовпці Y:", column_names)
+        type_list = make_list(0, 2, "Типи графіків:", plot_types)
+        type_list.selection_set(0)
+
+        def select_numeric():
+            y_list.selection_clear(0, "end")
+            for i in numeric:
+                y_list.selection_set(i)
+
+        tk.Button(batch_window, text="Усі числові", command=select_numeric).grid(row=2, column=1, padx=5, sticky="ew")
+
+        tk.Label(batch_window, text="Формат:").grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        format_combo = ttk.Combobox(batch_window, values=["png", "svg"], state="readonly")
+        format_combo.current(0)
+        format_combo.grid(row=3, column=1, padx=5, pady=5, sticky="ew")
+
+        tk.Label(batch_window, text="Кількість елементів (максимум):").grid(row=4, column=0, padx=5, pady=5, sticky="w")
+        limit_entry = tk.Entry(batch_window)
+        limit_entry.insert(0, str(self.processor.count_rows()))
+        limit_entry.grid(row=4, column=1, padx=5, pady=5, sticky="ew")
+
+        def on_start():
+            x_columns = [column_names[i] for i in x_list.curselection()]
+            y_columns = [column_names[i] for i in y_list.curselection()]
+            types = [plot_types[i] for i in type_list.curselection()]
+            jobs = [(x, y, t) for x in x_columns for y in y_columns for t in types if x != y]
+            if not jobs:
+                messagebox.showwarning("Увага", "Виберіть стовпці X, Y та типи графіків!", parent=batch_window)
+                return
+            try:
+                limit = int(limit_entry.get())
+            except ValueError:
+                messagebox.showwarning("Увага", "Кількість елементів має бути цілим числом!", parent=batch_window)
+                return
+            output_dir = filedialog.askdirectory(title="Тека для графіків", parent=batch_window)
+            if not output_dir:
+                return
+            batch_window.destroy()
+            self.render_batch(jobs, output_dir, format_combo.get(), limit)
+
+        tk.Button(batch_window, text="Побудувати", command=on_start).grid(row=4, column=2, padx=5, pady=5, sticky="ew")
+        batch_window.grid_rowconfigure(1, weight=1)
+        for column in range(3):
+            batch_window.grid_columnconfigure(column, weight=1)
+
+    def render_batch(self, jobs, output_dir, file_format, limit):
+        """
+        Запуск пакетної побудови графіків у фоні.
+        :param jobs: Список (стовпець X, стовпець Y, тип графіка)
+        """
+        processor = self.processor
+
+        def run(token):
+            started = time.perf_counter()
+            return render_charts(token, processor, jobs, output_dir, file_format, limit), time.perf_counter() - started
+
+        def on_done(result):
+            paths, elapsed = result
+            self.chart_files = list(dict.fromkeys(self.chart_files + paths))
+            for x_column, y_column, plot_type in jobs:
+                self.pipeline.record("plot", x_column=x_column, y_column=y_column, plot_type=plot_type, limit=limit)
+            self.status_label.config(
+                text=f"Побудовано графіків: {len(paths)} з {len(jobs)} за {elapsed:.1f} с ({output_dir})"
+            )
+
+        self.scheduler.submit(
+            "charts",
+            run,
+            on_done=on_done,
+            on_error=self.on_task_error("Не вдалося побудувати графіки"),
+            description=f"графіки ({len(jobs)})",
+        )
+
     def create_plot(self, x_column, y_column, plot_type, limit, preview_canvas=None, preview_only=False):
         """
         Створює графік із можливістю попереднього перегляду або відображення.
+        Підготовка даних виконується у фоні, малювання - у головному потоці.
         """
-        try:
-            # Вибір даних для побудови
-            data_limited = self.data.iloc[:limit]
+        def on_done(result):
+            try:
+                self.draw_plot(*result, preview_canvas=preview_canvas, preview_only=preview_only)
+            except Exception as e:
+                messagebox.showerror("Помилка", f"Не вдалося побудувати графік: {e}")
 
-            # Перевірка на числовий тип стовпців
-            x_is_numeric = pd.api.types.is_numeric_dtype(data_limited[x_column])
-            y_is_numeric = pd.api.types.is_numeric_dtype(data_limited[y_column])
+        if not preview_only:
+            self.pipeline.record("plot", x_column=x_column, y_column=y_column, plot_type=plot_type, limit=limit)
 
-            # Якщо стовпець не числовий, рахуємо кількість повторень
-            if not x_is_numeric:
-                count_dict = {value: (data_limited[x_column] == value).sum() for value in data_limited[x_column]}
-                data_limited = pd.DataFrame(list(count_dict.items()), columns=[x_column, "Кількість"])
-                x_column = x_column
-                y_column = "Кількість"
-
-            if not y_is_numeric:
-                count_dict = {value: (data_limited[y_column] == value).sum() for value in data_limited[y_column]}
-                data_limited = pd.DataFrame(list(count_dict.items()), columns=[y_column, "Кількість"])
-                x_column = y_column
-                y_column = "Кількість"
-            if plot_type == "Автоматичний":
-                    if data_limited[x_column].nunique() < 10:  # Кругова діаграма для категорій
-                        plot_type = "Кругова діаграма"
-                    elif pd.api.types.is_numeric_dtype(data_limited[y_column]):
-                        plot_type = "Лінійний"
-                    else:
-                        plot_type = "Стовпчастий"
-            # Побудова графіка
-            fig, ax = plt.subplots(figsize=(6, 4))
-            
-           
-            if plot_type == "Лінійний":
-                ax.plot(data_limited[x_column], data_limited[y_column], marker="o")
-            elif plot_type == "Стовпчастий":
-                ax.bar(data_limited[x_column], data_limited[y_column])
-            elif plot_type == "Точковий":
-                ax.scatter(data_limited[x_column], data_limited[y_column])
-            elif plot_type == "Гістограма":
-                ax.hist(data_limited[y_column], bins=10)
-            elif plot_type == "Кругова діаграма":
-                data_grouped = data_limited.groupby(x_column)[y_column].sum()
-                ax.pie(data_grouped, labels=data_grouped.index, autopct='%1.1f%%')
-
-            ax.set_title(f"{plot_type} графік: {y_column} vs {x_column}")
-            ax.set_xlabel(x_column)
-            ax.set_ylabel(y_column)
-
-            # Попередній перегляд у Canvas
-            if preview_only and preview_canvas:
-                from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-                if self.plot_preview_widget:
-                    self.plot_preview_widget.get_tk_widget().destroy()
-                self.plot_preview_widget = FigureCanvasTkAgg(fig, master=preview_canvas)
-                self.plot_preview_widget.draw()
-                self.plot_preview_widget.get_tk_widget().grid(row=0, column=0, sticky="nsew")
-                plt.close(fig)
-            else:
-                plt.show()
+        self.scheduler.submit(
+            "plot",
+            self.processor.plot_data,
+            x_column, y_column, plot_type, limit,
+            on_done=on_done,
+            on_error=self.on_task_error("Не вдалося побудувати графік"),
+            description="графік",
+        )
+
+    def draw_plot(self, data_limited, x_column, y_column, plot_type, preview_canvas=None, preview_only=False):
+        """
+        Малювання підготовленого графіка.
+        """
+        # Побудова графіка
+        fig, ax = plt.subplots(figsize=(6, 4))
+        draw_plot_axes(ax, data_limited, x_column, y_column, plot_type)
+
+        # Попередній перегляд у Canvas
+        if preview_only and preview_canvas:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            if self.plot_preview_widget:
+                self.plot_preview_widget.get_tk_widget().destroy()
+            self.plot_preview_widget = FigureCanvasTkAgg(fig, master=preview_canvas)
+            self.plot_preview_widget.draw()
+            self.plot_preview_widget.get_tk_widget().grid(row=0, column=0, sticky="nsew")
+            plt.close(fig)
+        else:
+            plt.show()
 
-        except Exception as e:
-            messagebox.showerror("Помилка", f"Не вдалося побудувати графік: {e}")
-            
     def apply_widget_styles(self):
         """
         Застосовує стилі до різних віджетів програми.
@@ -794,11 +4324,11 @@ class DataLoaderApp:
         # Перемикає між світлою та темною темами
         if self.is_dark_mode == False:
             self.enable_light_mode()
-            self.mainmenu.entryconfig(2, label="Темний режим")
+            self.mainmenu.entryconfig(self.theme_menu_index, label="Темний режим")
             self.is_dark_mode = True
         else:
             self.enable_dark_mode()
-            self.mainmenu.entryconfig(2, label="Світлий режим")
+            self.mainmenu.entryconfig(self.theme_menu_index, label="Світлий режим")
             self.is_dark_mode = False
         return self.is_dark_mode
         #self.is_dark_mode = not self.is_dark_mode